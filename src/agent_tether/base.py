@@ -7,18 +7,20 @@ Each bridge implements platform-specific message formatting and API interactions
 from __future__ import annotations
 
 import asyncio
+import functools
 import structlog
 import os
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import json
 import re
+import sys
 from pathlib import Path
 from typing import Callable, Awaitable, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 logger = structlog.get_logger(__name__)
 
@@ -102,6 +104,16 @@ _EXTERNAL_REPLAY_LIMIT = 10
 _EXTERNAL_REPLAY_MAX_CHARS = 3500
 _ALLOW_ALL_DURATION_S = 30 * 60  # 30 minutes
 
+# Snake_case parts rendered in upper case by _humanize_key.
+_HUMANIZE_ACRONYMS = frozenset(
+    {"id", "url", "api", "sdk", "http", "https", "cli", "ui", "sse", "mcp", "json"}
+)
+# Tool input keys rendered as inline code / fenced code blocks.
+_TOOL_INPUT_PATH_KEYS = frozenset({"file_path", "path", "notebook_path"})
+_TOOL_INPUT_CODE_KEYS = frozenset({"command", "old_string", "new_string", "content", "new_source"})
+# Values that look like enums (safe to humanize without mangling paths/commands).
+_ENUM_VALUE_RE = re.compile(r"[a-z0-9_]+")
+
 
 def _relative_time(iso_str: str) -> str:
     """Convert an ISO timestamp to a short relative time string like '2h ago'."""
@@ -126,14 +138,44 @@ def _relative_time(iso_str: str) -> str:
         return ""
 
 
+@functools.lru_cache(maxsize=128)
+def _starts_with_any_prefix(tool_name: str, prefixes: frozenset[str]) -> bool:
+    """Case-insensitive prefix test for tool names (cached; tool names are few)."""
+    return tool_name.strip().lower().startswith(tuple(prefixes))
+
+
+@functools.lru_cache(maxsize=1024)
+def _humanize_enum_str(s: str) -> str:
+    """Humanize an enum-looking snake_case string (cached; see _humanize_enum_value)."""
+    parts = [p for p in s.split("_") if p]
+    if not parts:
+        return s
+    out: list[str] = []
+    for i, p in enumerate(parts):
+        if p == "id":
+            out.append("ID")
+        elif i == 0:
+            out.append(p[:1].upper() + p[1:])
+        else:
+            out.append(p)
+    return " ".join(out)
+
+
 class ApprovalRequest(BaseModel):
-    """An approval request from an agent to a human."""
+    """An approval request from an agent to a human.
+
+    Immutable and hashable, so one instance can be shared between sessions
+    and used as a dict key. ``options`` is a tuple of labels; a list passed
+    at runtime is coerced to a tuple, but type-checked callers pass tuples.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     kind: Literal["permission", "choice"] = "permission"
     request_id: str
     title: str
     description: str
-    options: list[str]
+    options: tuple[str, ...]
     timeout_s: int = 300  # Default 5 minutes
 
 
@@ -155,6 +197,21 @@ class ApprovalResponse(BaseModel):
     timestamp: str | None = None
 
 
+@dataclass(slots=True)
+class _SessionState:
+    """Per-session bridge state, dropped as a unit when the session is removed."""
+
+    # Auto-approve timers (time.monotonic() deadlines)
+    allow_all_until: float = 0.0
+    allow_tool_until: dict[str, float] = field(default_factory=dict)
+    # Pending permission request awaiting a human response
+    pending_permission: ApprovalRequest | None = None
+    # Error debounce: last time an error status was sent (monotonic)
+    last_error_sent_at: float | None = None
+    # Buffered auto-approve notifications: (tool_name, reason)
+    auto_approve_buffer: list[tuple[str, str]] = field(default_factory=list)
+
+
 class BridgeInterface(ABC):
     """Abstract interface for messaging platform bridges.
 
@@ -182,57 +239,50 @@ class BridgeInterface(ABC):
         self._cached_external: list[dict] = []
         self._external_query: str | None = None
         self._external_view: list[dict] = []
-        # Auto-approve timers: session_id → expiry timestamp
-        self._allow_all_until: dict[str, float] = {}
-        self._allow_tool_until: dict[str, dict[str, float]] = {}
-        # Directory-scoped auto-approve: normalised_dir → expiry timestamp
+        # Per-session state (timers, pending request, debounce, buffers)
+        self._sessions: dict[str, _SessionState] = {}
+        # Directory-scoped auto-approve: normalised_dir → expiry (monotonic)
         self._allow_dir_until: dict[str, float] = {}
-        # Pending permission requests: session_id → request
-        self._pending_permissions: dict[str, ApprovalRequest] = {}
-        # Debounce error notifications: session_id -> last_sent_timestamp
-        self._last_error_status_sent_at: dict[str, float] = {}
-        # Auto-approve notification buffer: session_id → list of (tool_name, reason)
-        self._auto_approve_buffer: dict[str, list[tuple[str, str]]] = {}
         self._auto_approve_flush_tasks: dict[str, asyncio.Task] = {}
         # Delay before flushing buffered auto-approve notifications (seconds)
         self._auto_approve_flush_delay: float = 1.5
 
+    def _session_state(self, session_id: str) -> _SessionState:
+        """Return the state for a session, creating it on first use.
+
+        New keys are interned so later lookups can match on identity.
+        """
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[sys.intern(session_id)] = _SessionState()
+        return state
+
     # ------------------------------------------------------------------
     # Formatting helpers (shared across bridges)
     # ------------------------------------------------------------------
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _humanize_key(key: str) -> str:
         """Convert snake_case keys into a human-friendly label.
 
         Examples:
           output_mode -> Output mode
           session_id  -> Session ID
+
+        Cached: tool input keys come from a small vocabulary.
         """
         # Keep non-snake keys as-is (e.g. "-C", "argc").
         if not key or "_" not in key:
             return key
 
-        acronyms = {
-            "id",
-            "url",
-            "api",
-            "sdk",
-            "http",
-            "https",
-            "cli",
-            "ui",
-            "sse",
-            "mcp",
-            "json",
-        }
         parts = [p for p in key.strip().split("_") if p]
         if not parts:
             return key
         out: list[str] = []
         for i, p in enumerate(parts):
             low = p.lower()
-            if low in acronyms:
+            if low in _HUMANIZE_ACRONYMS:
                 out.append(low.upper())
             elif i == 0:
                 out.append(low[:1].upper() + low[1:])
@@ -247,21 +297,9 @@ class BridgeInterface(ABC):
         if "_" not in s:
             return s
         # Only touch values that look like enums to avoid mangling paths/commands.
-        if not re.fullmatch(r"[a-z0-9_]+", s):
-            return s
-        parts = [p for p in s.split("_") if p]
-        if not parts:
+        if not _ENUM_VALUE_RE.fullmatch(s):
             return s
-        out: list[str] = []
-        for i, p in enumerate(parts):
-            low = p.lower()
-            if low == "id":
-                out.append("ID")
-            elif i == 0:
-                out.append(low[:1].upper() + low[1:])
-            else:
-                out.append(low)
-        return " ".join(out)
+        return _humanize_enum_str(s)
 
     def format_tool_input_markdown(
         self,
@@ -283,9 +321,6 @@ class BridgeInterface(ABC):
         if not isinstance(obj, dict):
             return str(raw)
 
-        path_keys = {"file_path", "path", "notebook_path"}
-        code_block_keys = {"command", "old_string", "new_string", "content", "new_source"}
-
         lines: list[str] = []
         total = 0
         for key, value in obj.items():
@@ -297,16 +332,16 @@ class BridgeInterface(ABC):
             else:
                 v = self._humanize_enum_value(value)
 
-            limit = truncate_code if key_s in code_block_keys else truncate
+            limit = truncate_code if key_s in _TOOL_INPUT_CODE_KEYS else truncate
             if len(v) > limit:
                 v = v[:limit] + "..."
 
             # Prevent closing the code block early.
             v = v.replace("```", "``\\`")
 
-            if key_s in path_keys:
+            if key_s in _TOOL_INPUT_PATH_KEYS:
                 part = f"{label}: `{v}`"
-            elif key_s in code_block_keys:
+            elif key_s in _TOOL_INPUT_CODE_KEYS:
                 part = f"{label}:\n```\n{v}\n```"
             else:
                 part = f"{label}: {v}"
@@ -468,7 +503,11 @@ class BridgeInterface(ABC):
     # ------------------------------------------------------------------
 
     # Tools that require explicit human review and must never be auto-approved.
-    _NEVER_AUTO_APPROVE = {"task", "enterplanmode", "exitplanmode"}
+    _NEVER_AUTO_APPROVE = frozenset({"task", "enterplanmode", "exitplanmode"})
+
+    def _is_never_auto_approve(self, tool_name: str) -> bool:
+        """Return True if *tool_name* starts with a _NEVER_AUTO_APPROVE prefix."""
+        return _starts_with_any_prefix(tool_name or "", frozenset(self._NEVER_AUTO_APPROVE))
 
     def check_auto_approve(self, session_id: str, tool_name: str) -> str | None:
         """Check if an approval request should be auto-approved.
@@ -476,15 +515,15 @@ class BridgeInterface(ABC):
         Returns the reason string if auto-approved, or None.
         Tools in _NEVER_AUTO_APPROVE always require explicit approval.
         """
-        norm = (tool_name or "").strip().lower()
-        if any(norm.startswith(prefix) for prefix in self._NEVER_AUTO_APPROVE):
+        if self._is_never_auto_approve(tool_name):
             return None
-        now = time.time()
-        if now < self._allow_all_until.get(session_id, 0):
-            return "Allow All"
-        tool_expiry = self._allow_tool_until.get(session_id, {}).get(tool_name, 0)
-        if now < tool_expiry:
-            return f"Allow {tool_name}"
+        now = time.monotonic()
+        state = self._sessions.get(session_id)
+        if state is not None:
+            if now < state.allow_all_until:
+                return "Allow All"
+            if now < state.allow_tool_until.get(tool_name, 0):
+                return f"Allow {tool_name}"
         # Check directory-scoped timer
         reason = self._check_dir_auto_approve(session_id, now)
         if reason:
@@ -511,18 +550,18 @@ class BridgeInterface(ABC):
 
     def set_allow_all(self, session_id: str) -> None:
         """Enable auto-approve for all tools for 30 minutes."""
-        self._allow_all_until[session_id] = time.time() + _ALLOW_ALL_DURATION_S
+        self._session_state(session_id).allow_all_until = time.monotonic() + _ALLOW_ALL_DURATION_S
 
     def set_allow_tool(self, session_id: str, tool_name: str) -> None:
         """Enable auto-approve for a specific tool for 30 minutes."""
-        self._allow_tool_until.setdefault(session_id, {})[tool_name] = (
-            time.time() + _ALLOW_ALL_DURATION_S
+        self._session_state(session_id).allow_tool_until[sys.intern(tool_name)] = (
+            time.monotonic() + _ALLOW_ALL_DURATION_S
         )
 
     def set_allow_directory(self, directory: str) -> None:
         """Enable auto-approve for all sessions in *directory* for 30 minutes."""
         norm = os.path.normpath(directory)
-        self._allow_dir_until[norm] = time.time() + _ALLOW_ALL_DURATION_S
+        self._allow_dir_until[norm] = time.monotonic() + _ALLOW_ALL_DURATION_S
 
     async def _auto_approve(
         self, session_id: str, request: ApprovalRequest, *, reason: str = "Allow All"
@@ -553,8 +592,7 @@ class BridgeInterface(ABC):
         tool, this collects them and flushes after a short delay so rapid-fire
         approvals collapse into a single message.
         """
-        buf = self._auto_approve_buffer.setdefault(session_id, [])
-        buf.append((tool_name, reason))
+        self._session_state(session_id).auto_approve_buffer.append((tool_name, reason))
 
         # Cancel existing flush timer and start a new one
         existing = self._auto_approve_flush_tasks.pop(session_id, None)
@@ -572,7 +610,10 @@ class BridgeInterface(ABC):
         except asyncio.CancelledError:
             return
         self._auto_approve_flush_tasks.pop(session_id, None)
-        items = self._auto_approve_buffer.pop(session_id, [])
+        state = self._sessions.get(session_id)
+        if state is None:
+            return
+        items, state.auto_approve_buffer = state.auto_approve_buffer, []
         if items:
             await self.send_auto_approve_batch(session_id, items)
 
@@ -646,8 +687,9 @@ class BridgeInterface(ABC):
             "claude": "claude_auto",
             "codex": "codex_sdk_sidecar",
         }
-        if key in aliases:
-            return aliases[key]
+        alias = aliases.get(key)
+        if alias:
+            return alias
         # Allow explicit adapter names.
         if key in {"claude_auto", "claude_subprocess", "claude_api", "codex_sdk_sidecar"}:
             return key
@@ -678,15 +720,18 @@ class BridgeInterface(ABC):
 
     def set_pending_permission(self, session_id: str, request: ApprovalRequest) -> None:
         """Track a pending permission request for a session."""
-        self._pending_permissions[session_id] = request
+        self._session_state(session_id).pending_permission = request
 
     def get_pending_permission(self, session_id: str) -> ApprovalRequest | None:
         """Get the pending permission request for a session, if any."""
-        return self._pending_permissions.get(session_id)
+        state = self._sessions.get(session_id)
+        return state.pending_permission if state is not None else None
 
     def clear_pending_permission(self, session_id: str) -> None:
         """Clear the pending permission request for a session."""
-        self._pending_permissions.pop(session_id, None)
+        state = self._sessions.get(session_id)
+        if state is not None:
+            state.pending_permission = None
 
     async def _respond_to_permission(
         self,
@@ -807,10 +852,10 @@ class BridgeInterface(ABC):
 
     async def on_session_removed(self, session_id: str) -> None:
         """Clean up when a session is deleted."""
-        self._allow_all_until.pop(session_id, None)
-        self._allow_tool_until.pop(session_id, None)
-        self._pending_permissions.pop(session_id, None)
-        self._last_error_status_sent_at.pop(session_id, None)
+        self._sessions.pop(session_id, None)
+        flush_task = self._auto_approve_flush_tasks.pop(session_id, None)
+        if flush_task:
+            flush_task.cancel()
 
     def _should_send_error_status(self, session_id: str) -> bool:
         """Return True if an 'error' status notification should be sent now.
@@ -821,12 +866,13 @@ class BridgeInterface(ABC):
         if debounce_s == 0:
             return True
 
-        now_ts = time.time()
-        last = self._last_error_status_sent_at.get(session_id)
+        now_ts = time.monotonic()
+        state = self._session_state(session_id)
+        last = state.last_error_sent_at
         if last is not None and (now_ts - last) < debounce_s:
             return False
 
-        self._last_error_status_sent_at[session_id] = now_ts
+        state.last_error_sent_at = now_ts
         return True
 
     # ------------------------------------------------------------------
@@ -7,12 +7,13 @@ reset by deleting the JSON file in the data dir.
 
 from __future__ import annotations
 
-import json
 import secrets
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from agent_tether import json_codec
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -50,7 +51,7 @@ def load_or_create(
     state: DiscordPairingState | None = None
     if path.exists():
         try:
-            raw = json.loads(path.read_text("utf-8"))
+            raw = json_codec.loads(path.read_bytes())
             code = str(raw.get("pairing_code") or "").strip()
             ids_raw = raw.get("paired_user_ids") or []
             ids = {int(x) for x in ids_raw if str(x).strip()}
@@ -85,5 +86,5 @@ def load_or_create(
 
 
 def save(*, path: Path, state: DiscordPairingState) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(state.to_json(), indent=2, sort_keys=True) + "\n", "utf-8")
+    data = json_codec.dumps(state.to_json(), pretty=True, sort_keys=True)
+    json_codec.write_atomic(path, data, mode=0o600)
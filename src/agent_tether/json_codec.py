@@ -0,0 +1,85 @@
+"""JSON encoding for small state files.
+
+Uses orjson when it is installed (``pip install agent-tether[fast]``) and
+falls back to the stdlib ``json`` module otherwise. Both paths produce the
+same document shape so state files stay interchangeable.
+
+``write_atomic`` replaces a state file in one step, so a crash mid-write
+never leaves a truncated file behind. By default it also syncs the data to
+disk before the rename so the file survives a power loss; frequently
+rewritten, easily rebuilt state can skip that with ``fsync=False``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import stat
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(obj: Any, *, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize *obj* to UTF-8 JSON bytes.
+
+    With ``pretty=True`` the output is indented by two spaces and ends with
+    a newline, matching ``json.dumps(obj, indent=2) + "\\n"``.
+    """
+    if orjson is not None:
+        option = 0
+        if pretty:
+            option |= orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+
+    text = json.dumps(obj, indent=2 if pretty else None, sort_keys=sort_keys, ensure_ascii=False)
+    if pretty:
+        text += "\n"
+    return text.encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str. Raises ``ValueError`` on invalid input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_atomic(path: Path, data: bytes, *, mode: int | None = None, fsync: bool = True) -> None:
+    """Write *data* to *path* via a temp file in the same directory + ``os.replace``.
+
+    The file gets *mode* if given; otherwise an existing target keeps its
+    permissions and a new one gets the usual umask-based default. With
+    ``fsync=False`` the blocking sync before the rename is skipped.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if mode is None:
+        try:
+            mode = stat.S_IMODE(path.stat().st_mode)
+        except FileNotFoundError:
+            pass
+    tmp = path.with_name(f".{path.name}.{secrets.token_hex(8)}.tmp")
+    # Not mkstemp: that forces 0600, while 0o666 lets the umask apply as for open().
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
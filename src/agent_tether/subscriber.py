@@ -5,9 +5,9 @@ from __future__ import annotations
 import asyncio
 import json
 import structlog
-from typing import Callable
+from typing import Any, Callable
 
-from agent_tether.base import ApprovalRequest
+from agent_tether.base import ApprovalRequest, BridgeInterface
 from agent_tether.manager import BridgeManager
 
 logger = structlog.get_logger(__name__)
@@ -155,7 +155,12 @@ class BridgeSubscriber:
     # ------------------------------------------------------------------
 
     async def _consume(self, session_id: str, platform: str, queue: asyncio.Queue) -> None:
-        """Background task that reads from a store subscriber and routes events."""
+        """Background task that reads from a store subscriber and routes events.
+
+        Each event is marked done on the queue once it has been routed, so
+        callers can ``await queue.join()`` to wait until the consumer has
+        caught up.
+        """
         bridge = self._bridge_manager.get_bridge(platform)
         if not bridge:
             logger.warning(
@@ -167,120 +172,127 @@ class BridgeSubscriber:
         try:
             while True:
                 event = await queue.get()
-                event_type = event.get("type")
-                data = event.get("data", {})
-
-                # Skip history replay events
-                if data.get("is_history"):
-                    continue
-
                 try:
-                    if event_type == "output":
-                        text = data.get("text", "")
-                        if not text:
-                            continue
-                        is_final = bool(data.get("final"))
-
-                        if is_final:
-                            # Final output: flush any buffered step output first,
-                            # then send the final text immediately.
-                            await self._flush_output(session_id, bridge)
-                            await bridge.on_output(
-                                session_id,
-                                text,
-                                metadata={"final": True, "kind": "final"},
-                            )
-                        else:
-                            # Step output: buffer and flush on a timer
-                            self._buffer_output(session_id, text)
-                            await self._schedule_flush(session_id, bridge)
-
-                    elif event_type == "output_final":
-                        # Accumulated blob -- skip, we forward per-step
-                        # events above instead.
-                        pass
-
-                    elif event_type == "permission_request":
-                        # Flush buffered output before showing approval request
-                        await self._flush_output(session_id, bridge)
-
-                        tool_input = data.get("tool_input", {})
-                        tool_name = data.get("tool_name", "Permission request")
-
-                        # Special-case multi-choice questions coming through as a "tool".
-                        # Codex emits these as AskUserQuestion with a structured schema.
-                        if (
-                            isinstance(tool_input, dict)
-                            and str(tool_name).startswith("AskUserQuestion")
-                            and isinstance(tool_input.get("questions"), list)
-                            and tool_input["questions"]
-                            and isinstance(tool_input["questions"][0], dict)
-                        ):
-                            q = tool_input["questions"][0]
-                            header = str(q.get("header") or "Question")
-                            question = str(q.get("question") or "")
-                            options = q.get("options") or []
-                            labels: list[str] = []
-                            lines: list[str] = [question.strip()] if question else []
-                            for i, opt in enumerate(options, start=1):
-                                if not isinstance(opt, dict):
-                                    continue
-                                label = str(opt.get("label") or "").strip()
-                                desc = str(opt.get("description") or "").strip()
-                                if not label:
-                                    continue
-                                labels.append(label)
-                                if desc:
-                                    lines.append(f"{i}. {label} - {desc}")
-                                else:
-                                    lines.append(f"{i}. {label}")
-
-                            request = ApprovalRequest(
-                                kind="choice",
-                                request_id=data.get("request_id", ""),
-                                title=header,
-                                description="\n".join([l for l in lines if l]).strip(),
-                                options=labels,
-                            )
-                        else:
-                            description = (
-                                json.dumps(tool_input)
-                                if isinstance(tool_input, dict)
-                                else str(tool_input)
-                            )
-                            request = ApprovalRequest(
-                                kind="permission",
-                                request_id=data.get("request_id", ""),
-                                title=tool_name,
-                                description=description,
-                                options=["Allow", "Deny"],
-                            )
-                        await bridge.on_approval_request(session_id, request)
-
-                    elif event_type == "session_state":
-                        state = data.get("state", "")
-                        if state == "RUNNING":
-                            await bridge.on_typing(session_id)
-                        elif state == "AWAITING_INPUT":
-                            # Flush any remaining output before stopping typing
-                            await self._flush_output(session_id, bridge)
-                            await bridge.on_typing_stopped(session_id)
-                        elif state == "ERROR":
-                            await self._flush_output(session_id, bridge)
-                            await bridge.on_typing_stopped(session_id)
-                            await bridge.on_status_change(session_id, "error")
-
-                    elif event_type == "error":
-                        await self._flush_output(session_id, bridge)
-                        msg = data.get("message", "Unknown error")
-                        await bridge.on_status_change(session_id, "error", {"message": msg})
-
-                except Exception:
-                    logger.exception(
-                        "Failed to route event to bridge",
-                        extra={"session_id": session_id, "event_type": event_type},
-                    )
+                    await self._route_event(session_id, bridge, event)
+                finally:
+                    queue.task_done()
         except asyncio.CancelledError:
             pass
         finally:
             self._remove_subscriber(session_id, queue)
+
+    async def _route_event(
+        self, session_id: str, bridge: BridgeInterface, event: dict[str, Any]
+    ) -> None:
+        """Route a single store event to the bridge."""
+        event_type = event.get("type")
+        data = event.get("data", {})
+
+        # Skip history replay events
+        if data.get("is_history"):
+            return
+
+        try:
+            if event_type == "output":
+                text = data.get("text", "")
+                if not text:
+                    return
+                is_final = bool(data.get("final"))
+
+                if is_final:
+                    # Final output: flush any buffered step output first,
+                    # then send the final text immediately.
+                    await self._flush_output(session_id, bridge)
+                    await bridge.on_output(
+                        session_id,
+                        text,
+                        metadata={"final": True, "kind": "final"},
+                    )
+                else:
+                    # Step output: buffer and flush on a timer
+                    self._buffer_output(session_id, text)
+                    await self._schedule_flush(session_id, bridge)
+
+            elif event_type == "output_final":
+                # Accumulated blob -- skip, we forward per-step
+                # events above instead.
+                pass
+
+            elif event_type == "permission_request":
+                # Flush buffered output before showing approval request
+                await self._flush_output(session_id, bridge)
+
+                tool_input = data.get("tool_input", {})
+                tool_name = data.get("tool_name", "Permission request")
+
+                # Special-case multi-choice questions coming through as a "tool".
+                # Codex emits these as AskUserQuestion with a structured schema.
+                if (
+                    isinstance(tool_input, dict)
+                    and str(tool_name).startswith("AskUserQuestion")
+                    and isinstance(tool_input.get("questions"), list)
+                    and tool_input["questions"]
+                    and isinstance(tool_input["questions"][0], dict)
+                ):
+                    q = tool_input["questions"][0]
+                    header = str(q.get("header") or "Question")
+                    question = str(q.get("question") or "")
+                    options = q.get("options") or []
+                    labels: list[str] = []
+                    lines: list[str] = [question.strip()] if question else []
+                    for i, opt in enumerate(options, start=1):
+                        if not isinstance(opt, dict):
+                            continue
+                        label = str(opt.get("label") or "").strip()
+                        desc = str(opt.get("description") or "").strip()
+                        if not label:
+                            continue
+                        labels.append(label)
+                        if desc:
+                            lines.append(f"{i}. {label} - {desc}")
+                        else:
+                            lines.append(f"{i}. {label}")
+
+                    request = ApprovalRequest(
+                        kind="choice",
+                        request_id=data.get("request_id", ""),
+                        title=header,
+                        description="\n".join([l for l in lines if l]).strip(),
+                        options=tuple(labels),
+                    )
+                else:
+                    description = (
+                        json.dumps(tool_input) if isinstance(tool_input, dict) else str(tool_input)
+                    )
+                    request = ApprovalRequest(
+                        kind="permission",
+                        request_id=data.get("request_id", ""),
+                        title=tool_name,
+                        description=description,
+                        options=("Allow", "Deny"),
+                    )
+                await bridge.on_approval_request(session_id, request)
+
+            elif event_type == "session_state":
+                state = data.get("state", "")
+                if state == "RUNNING":
+                    await bridge.on_typing(session_id)
+                elif state == "AWAITING_INPUT":
+                    # Flush any remaining output before stopping typing
+                    await self._flush_output(session_id, bridge)
+                    await bridge.on_typing_stopped(session_id)
+                elif state == "ERROR":
+                    await self._flush_output(session_id, bridge)
+                    await bridge.on_typing_stopped(session_id)
+                    await bridge.on_status_change(session_id, "error")
+
+            elif event_type == "error":
+                await self._flush_output(session_id, bridge)
+                msg = data.get("message", "Unknown error")
+                await bridge.on_status_change(session_id, "error", {"message": msg})
+
+        except Exception:
+            logger.exception(
+                "Failed to route event to bridge",
+                extra={"session_id": session_id, "event_type": event_type},
+            )
@@ -1304,8 +1304,7 @@ class TelegramBridge(BridgeInterface):
 
         tool_name = request.title
         rid = request.request_id
-        tool_lower = tool_name.strip().lower()
-        is_task = any(tool_lower.startswith(p) for p in self._NEVER_AUTO_APPROVE)
+        is_task = self._is_never_auto_approve(tool_name)
 
         # Cache full description for "Show All"
         if was_truncated:
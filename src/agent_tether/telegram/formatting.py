@@ -3,35 +3,28 @@
 import html
 import re
 
+# Characters Telegram MarkdownV2 requires to be backslash-escaped.
+_MARKDOWN_V2_ESCAPES = str.maketrans({c: f"\\{c}" for c in "_*[]()~`>#+-=|{}.!"})
+
+_TABLE_BLOCK_RE = re.compile(r"(?:^\|.+\|$\n?){2,}", re.MULTILINE)
+_TABLE_SEPARATOR_CELL_RE = re.compile(r"-{2,}|:?-+:?")
+_FENCED_CODE_RE = re.compile(r"```(?:\w*)\n(.*?)```", re.DOTALL)
+_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+_BOLD_STARS_RE = re.compile(r"\*\*(.+?)\*\*")
+_BOLD_UNDERSCORES_RE = re.compile(r"__(.+?)__")
+_ITALIC_STAR_RE = re.compile(r"(?<!\w)\*([^*]+?)\*(?!\w)")
+_ITALIC_UNDERSCORE_RE = re.compile(r"(?<!\w)_([^_]+?)_(?!\w)")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+_HEADER_RE = re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE)
+_TOOL_MARKER_RE = re.compile(r"^\[tool:\s*\w+\]\s*$", re.MULTILINE)
+
 
 def escape_markdown(text: str) -> str:
     """Escape special characters for Telegram MarkdownV2.
 
     Telegram MarkdownV2 requires escaping many special characters.
     """
-    special_chars = [
-        "_",
-        "*",
-        "[",
-        "]",
-        "(",
-        ")",
-        "~",
-        "`",
-        ">",
-        "#",
-        "+",
-        "-",
-        "=",
-        "|",
-        "{",
-        "}",
-        ".",
-        "!",
-    ]
-    for char in special_chars:
-        text = text.replace(char, f"\\{char}")
-    return text
+    return text.translate(_MARKDOWN_V2_ESCAPES)
 
 
 def _markdown_table_to_pre(text: str) -> str:
@@ -48,7 +41,7 @@ def _markdown_table_to_pre(text: str) -> str:
         for line in lines:
             cells = [c.strip() for c in line.strip().strip("|").split("|")]
             # Skip separator rows like |---|---|
-            if all(re.fullmatch(r"-{2,}|:?-+:?", c) for c in cells):
+            if all(_TABLE_SEPARATOR_CELL_RE.fullmatch(c) for c in cells):
                 continue
             rows.append(cells)
         if not rows:
@@ -71,12 +64,7 @@ def _markdown_table_to_pre(text: str) -> str:
         return "<pre>" + "\n".join(formatted) + "</pre>"
 
     # Match consecutive lines that start with |
-    return re.sub(
-        r"(?:^\|.+\|$\n?){2,}",
-        _format_table,
-        text,
-        flags=re.MULTILINE,
-    )
+    return _TABLE_BLOCK_RE.sub(_format_table, text)
 
 
 def markdown_to_telegram_html(text: str) -> str:
@@ -92,29 +80,24 @@ def markdown_to_telegram_html(text: str) -> str:
     text = _markdown_table_to_pre(text)
 
     # Fenced code blocks: ```lang\n...\n``` → <pre>...</pre>
-    text = re.sub(
-        r"```(?:\w*)\n(.*?)```",
-        lambda m: f"<pre>{m.group(1).rstrip()}</pre>",
-        text,
-        flags=re.DOTALL,
-    )
+    text = _FENCED_CODE_RE.sub(lambda m: f"<pre>{m.group(1).rstrip()}</pre>", text)
 
     # Inline code: `...` → <code>...</code>
-    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+    text = _INLINE_CODE_RE.sub(r"<code>\1</code>", text)
 
     # Bold: **text** or __text__
-    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
-    text = re.sub(r"__(.+?)__", r"<b>\1</b>", text)
+    text = _BOLD_STARS_RE.sub(r"<b>\1</b>", text)
+    text = _BOLD_UNDERSCORES_RE.sub(r"<b>\1</b>", text)
 
     # Italic: *text* or _text_ (but not inside words with underscores)
-    text = re.sub(r"(?<!\w)\*([^*]+?)\*(?!\w)", r"<i>\1</i>", text)
-    text = re.sub(r"(?<!\w)_([^_]+?)_(?!\w)", r"<i>\1</i>", text)
+    text = _ITALIC_STAR_RE.sub(r"<i>\1</i>", text)
+    text = _ITALIC_UNDERSCORE_RE.sub(r"<i>\1</i>", text)
 
     # Links: [text](url)
-    text = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', text)
+    text = _LINK_RE.sub(r'<a href="\2">\1</a>', text)
 
     # Headers: # Title → bold
-    text = re.sub(r"^#{1,6}\s+(.+)$", r"<b>\1</b>", text, flags=re.MULTILINE)
+    text = _HEADER_RE.sub(r"<b>\1</b>", text)
 
     return text
 
@@ -124,7 +107,7 @@ def strip_tool_markers(text: str) -> str:
 
     These appear in Claude Code session history and add noise to replays.
     """
-    return re.sub(r"^\[tool:\s*\w+\]\s*$", "", text, flags=re.MULTILINE).strip()
+    return _TOOL_MARKER_RE.sub("", text).strip()
 
 
 def chunk_message(text: str, limit: int = 4096) -> list[str]:
@@ -140,7 +123,4 @@ def chunk_message(text: str, limit: int = 4096) -> list[str]:
     if len(text) <= limit:
         return [text]
 
-    chunks = []
-    for i in range(0, len(text), limit):
-        chunks.append(text[i : i + limit])
-    return chunks
+    return [text[i : i + limit] for i in range(0, len(text), limit)]
@@ -1,12 +1,15 @@
 """State management for Telegram session-to-topic mappings."""
 
-import json
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
 import structlog
 
+from agent_tether import json_codec
+
 logger = structlog.get_logger(__name__)
 
 
@@ -23,13 +26,16 @@ class StateManager:
     """Manages persistent state for session↔topic mappings.
 
     Stores mappings as JSON to preserve connections between sessions
-    and their forum topics across restarts.
+    and their forum topics across restarts. Every change is saved
+    immediately unless made inside ``batch()``.
     """
 
     def __init__(self, path: str):
         self._path = Path(path)
         self._mappings: dict[str, TopicMapping] = {}
         self._topic_to_session: dict[int, str] = {}
+        self._batch_depth = 0
+        self._dirty = False
 
     def load(self) -> None:
         """Load state from disk."""
@@ -38,8 +44,7 @@ class StateManager:
             return
 
         try:
-            with self._path.open() as f:
-                data = json.load(f)
+            data = json_codec.loads(self._path.read_bytes())
 
             mappings_data = data.get("mappings", {})
             for session_id, mapping_data in mappings_data.items():
@@ -63,12 +68,34 @@ class StateManager:
                     session_id: asdict(mapping) for session_id, mapping in self._mappings.items()
                 },
             }
-            self._path.parent.mkdir(parents=True, exist_ok=True)
-            with self._path.open("w") as f:
-                json.dump(data, f, indent=2)
+            # Saved on every topic change from async handlers, so skip the fsync.
+            json_codec.write_atomic(self._path, json_codec.dumps(data, pretty=True), fsync=False)
         except Exception:
             logger.exception("Failed to save Telegram state")
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer saving until the outermost ``batch()`` block exits.
+
+        Changes made inside the block are written to disk once on exit,
+        even if the block raises, so the file matches the in-memory state.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self._dirty = False
+                self.save()
+
+    def _changed(self) -> None:
+        """Save now, or mark dirty when inside ``batch()``."""
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self.save()
+
     def get_topic_for_session(self, session_id: str) -> int | None:
         """Get the topic ID for a session."""
         mapping = self._mappings.get(session_id)
@@ -83,14 +110,14 @@ class StateManager:
         )
         self._mappings[session_id] = mapping
         self._topic_to_session[topic_id] = session_id
-        self.save()
+        self._changed()
 
     def remove_session(self, session_id: str) -> None:
         """Remove a session↔topic mapping."""
         mapping = self._mappings.pop(session_id, None)
         if mapping:
             self._topic_to_session.pop(mapping.topic_id, None)
-            self.save()
+            self._changed()
 
     def get_session_for_topic(self, topic_id: int) -> str | None:
         """Get the session ID for a topic."""
@@ -8,6 +8,9 @@ bridges only implement the transport layer.
 
 from __future__ import annotations
 
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import structlog
@@ -30,6 +33,9 @@ from agent_tether.thread_naming import format_thread_name
 logger = structlog.get_logger(__name__)
 
 _THREAD_NAME_MAX_LEN = 64
+_REPLAY_ROLE_PREFIXES = {"user": "👤", "assistant": "🤖"}
+# A leading integer token in ``!list`` args selects a page.
+_LIST_PAGE_RE = re.compile(r"([+-]?\d+)(?!\S)")
 
 
 class TextCommandBridge(BridgeInterface):
@@ -66,6 +72,11 @@ class TextCommandBridge(BridgeInterface):
         self._thread_name_path = thread_name_path
         self._thread_names: dict[str, str] = load_mapping(path=self._thread_name_path)
         self._used_thread_names: set[str] = set(self._thread_names.values())
+        # Lowest suffix that may still be free per base name, so repeated
+        # picks don't re-probe every taken "Name 2", "Name 3", ...
+        self._thread_suffix_hints: dict[str, int] = {}
+        self._thread_batch_depth = 0
+        self._thread_names_dirty = False
 
     # ------------------------------------------------------------------
     # Thread naming
@@ -78,11 +89,12 @@ class TextCommandBridge(BridgeInterface):
         if base_name not in self._used_thread_names:
             return base_name
 
-        for i in range(2, 100):
+        for i in range(self._thread_suffix_hints.get(base_name, 2), 100):
             suffix = f" {i}"
             avail = max(1, _THREAD_NAME_MAX_LEN - len(suffix))
             candidate = (base_name[:avail] + suffix)[:_THREAD_NAME_MAX_LEN]
             if candidate not in self._used_thread_names:
+                self._thread_suffix_hints[base_name] = i
                 return candidate
 
         return base_name
@@ -108,16 +120,47 @@ class TextCommandBridge(BridgeInterface):
         return self._pick_unique_thread_name(base_name)
 
     def _reserve_thread_name(self, session_id: str, name: str) -> None:
-        """Persist a session-to-name mapping and mark the name as used."""
+        """Persist a session-to-name mapping and mark the name as used.
+
+        Re-reserving the name a session already holds is a no-op and does
+        not rewrite the file.
+        """
+        if self._thread_names.get(session_id) == name:
+            return
         self._thread_names[session_id] = name
         self._used_thread_names.add(name)
-        save_mapping(path=self._thread_name_path, mapping=self._thread_names)
+        self._thread_names_changed()
 
     def _release_thread_name(self, session_id: str) -> None:
         """Release a previously reserved thread name."""
         name = self._thread_names.pop(session_id, None)
         if name:
             self._used_thread_names.discard(name)
+            # A lower suffix may be free again
+            self._thread_suffix_hints.clear()
+            self._thread_names_changed()
+
+    @contextmanager
+    def batch_thread_mutations(self) -> Iterator[None]:
+        """Defer saving thread names until the outermost block exits.
+
+        Reservations and releases inside the block are written to disk once
+        on exit, even if the block raises.
+        """
+        self._thread_batch_depth += 1
+        try:
+            yield
+        finally:
+            self._thread_batch_depth -= 1
+            if self._thread_batch_depth == 0 and self._thread_names_dirty:
+                self._thread_names_dirty = False
+                save_mapping(path=self._thread_name_path, mapping=self._thread_names)
+
+    def _thread_names_changed(self) -> None:
+        """Save thread names now, or mark dirty inside ``batch_thread_mutations()``."""
+        if self._thread_batch_depth:
+            self._thread_names_dirty = True
+        else:
             save_mapping(path=self._thread_name_path, mapping=self._thread_names)
 
     # ------------------------------------------------------------------
@@ -188,13 +231,12 @@ class TextCommandBridge(BridgeInterface):
 
         Returns (page_number, search_query_or_None).
         """
+        args = (args or "").strip()
         if not args:
             return 1, None
-        first = args.split()[0]
-        try:
-            return int(first), self._external_query
-        except ValueError:
-            return 1, args.strip()
+        if match := _LIST_PAGE_RE.match(args):
+            return int(match.group(1)), self._external_query
+        return 1, args
 
     # ------------------------------------------------------------------
     # Approval text handling
@@ -284,11 +326,7 @@ class TextCommandBridge(BridgeInterface):
         ]
         for i, msg in enumerate(messages, 1):
             role = str(msg.get("role") or "").lower()
-            prefix = (
-                "👤"
-                if role == "user"
-                else ("🤖" if role == "assistant" else role[:1].upper() or "?")
-            )
+            prefix = _REPLAY_ROLE_PREFIXES.get(role) or role[:1].upper() or "?"
             content = (msg.get("content") or "").strip()
             thinking = (msg.get("thinking") or "").strip()
             if content and len(content) > content_limit:
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+
 RUNNER_DISPLAY_NAMES: dict[str, str] = {
     "claude-subprocess": "Claude",
     "claude-local": "Claude",
@@ -32,6 +34,13 @@ def runner_display_name(runner_type: str | None) -> str:
     return RUNNER_DISPLAY_NAMES.get(runner_type or "", "")
 
 
+@functools.lru_cache(maxsize=512)
+def _directory_label(directory: str) -> str:
+    """Capitalized last path component of a directory, or "Session" if empty."""
+    dir_short = directory.rstrip("/").rsplit("/", 1)[-1] or "Session"
+    return dir_short[:1].upper() + dir_short[1:]
+
+
 def format_thread_name(
     *,
     directory: str | None,
@@ -40,8 +49,7 @@ def format_thread_name(
     max_len: int = 64,
 ) -> str:
     """Format a thread or topic name from directory and runner info."""
-    dir_short = (directory or "").rstrip("/").rsplit("/", 1)[-1] or "Session"
-    dir_label = dir_short[:1].upper() + dir_short[1:]
+    dir_label = _directory_label(directory or "")
 
     rt = runner_type or adapter_to_runner(adapter)
     runner_label = runner_display_name(rt)
@@ -8,31 +8,30 @@ across restarts.
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
+from agent_tether import json_codec
+
 
 def load_mapping(*, path: Path) -> dict[str, str]:
     if not path.exists():
         return {}
     try:
-        raw = json.loads(path.read_text("utf-8"))
+        data = path.read_bytes()
+        # Anything but a JSON object is discarded anyway; skip the parser.
+        if not data.lstrip().startswith(b"{"):
+            return {}
+        raw = json_codec.loads(data)
         if not isinstance(raw, dict):
             return {}
-        out: dict[str, str] = {}
-        for k, v in raw.items():
-            ks = str(k).strip()
-            vs = str(v).strip()
-            if ks and vs:
-                out[ks] = vs
-        return out
+        pairs = ((str(k).strip(), str(v).strip()) for k, v in raw.items())
+        return {k: v for k, v in pairs if k and v}
     except Exception:
         return {}
 
 
 def save_mapping(*, path: Path, mapping: dict[str, str]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(
-        json.dumps(dict(sorted(mapping.items())), indent=2, sort_keys=True) + "\n",
-        "utf-8",
-    )
+    # Rewritten on every thread reservation from async handlers, so skip the
+    # blocking fsync. Losing the latest names on power loss is harmless.
+    data = json_codec.dumps(mapping, pretty=True, sort_keys=True)
+    json_codec.write_atomic(path, data, fsync=False)
@@ -0,0 +1,77 @@
+"""Shared test helpers."""
+
+import asyncio
+from collections import defaultdict
+
+from agent_tether.base import ApprovalRequest, BridgeConfig, BridgeInterface
+
+
+class RecordingBridge(BridgeInterface):
+    """Bridge that records every call in ``events``, keyed by kind.
+
+    Kinds and recorded values:
+      output          (session_id, text, metadata)
+      approval        (session_id, request)
+      status          (session_id, status, metadata)
+      typing_started  session_id
+      typing_stopped  session_id
+      session_removed session_id
+      thread          (session_id, session_name, thread_id)
+
+    Tests that wait on something other than the subscriber queue (e.g. a
+    flush timer) can ``await bridge.wait_for(kind)`` instead of sleeping.
+    """
+
+    def __init__(self, name: str = "test"):
+        super().__init__(BridgeConfig())
+        self.name = name
+        self.events: defaultdict[str, list] = defaultdict(list)
+        self._changed = asyncio.Event()
+
+    def _record(self, kind: str, value) -> None:
+        self.events[kind].append(value)
+        self._changed.set()
+
+    async def wait_for(self, kind: str, count: int = 1, timeout: float = 1.0) -> None:
+        """Wait until at least ``count`` calls of ``kind`` have been recorded."""
+        async with asyncio.timeout(timeout):
+            while len(self.events[kind]) < count:
+                self._changed.clear()
+                await self._changed.wait()
+
+    async def on_output(self, session_id, text, metadata=None):
+        self._record("output", (session_id, text, metadata))
+
+    async def on_approval_request(self, session_id, request: ApprovalRequest):
+        self._record("approval", (session_id, request))
+
+    async def on_status_change(self, session_id, status, metadata=None):
+        self._record("status", (session_id, status, metadata))
+
+    async def on_typing(self, session_id):
+        self._record("typing_started", session_id)
+
+    async def on_typing_stopped(self, session_id):
+        self._record("typing_stopped", session_id)
+
+    async def on_session_removed(self, session_id):
+        self._record("session_removed", session_id)
+        await super().on_session_removed(session_id)
+
+    async def create_thread(self, session_id, session_name):
+        thread_id = f"{self.name}_thread_{len(self.events['thread'])}"
+        self._record("thread", (session_id, session_name, thread_id))
+        return {"thread_id": thread_id, "platform": self.name}
+
+
+def async_return(value):
+    """Return an async function that ignores its arguments and returns ``value``.
+
+    A lighter stand-in for ``AsyncMock(return_value=value)`` when the test
+    never inspects the calls.
+    """
+
+    async def _return(*args, **kwargs):
+        return value
+
+    return _return
@@ -1,14 +1,15 @@
 """Tests for BridgeConfig and type aliases."""
 
+from dataclasses import astuple
+
 from agent_tether.base import BridgeConfig
 
 
 def test_default_values():
     """Test BridgeConfig default values."""
     config = BridgeConfig()
-    assert config.data_dir == ""
-    assert config.error_debounce_seconds == 0
-    assert config.default_adapter is None
+    # (data_dir, default_adapter, error_debounce_seconds)
+    assert astuple(config) == ("", None, 0)
 
 
 def test_custom_values():
@@ -18,9 +19,7 @@ def test_custom_values():
         error_debounce_seconds=5,
         default_adapter="claude_auto",
     )
-    assert config.data_dir == "/custom/path"
-    assert config.error_debounce_seconds == 5
-    assert config.default_adapter == "claude_auto"
+    assert astuple(config) == ("/custom/path", "claude_auto", 5)
 
 
 def test_round_trip():
@@ -37,6 +36,4 @@ def test_round_trip():
         default_adapter=original.default_adapter,
     )
 
-    assert copy.data_dir == original.data_dir
-    assert copy.error_debounce_seconds == original.error_debounce_seconds
-    assert copy.default_adapter == original.default_adapter
+    assert copy == original
@@ -6,6 +6,7 @@ import time
 from unittest.mock import AsyncMock
 
 import pytest
+from pydantic import ValidationError
 
 from agent_tether.base import ApprovalRequest, BridgeConfig, BridgeInterface
 
@@ -47,6 +48,12 @@ class FakeBridge(BridgeInterface):
         return thread_id
 
 
+@pytest.fixture
+def bridge():
+    """A fresh FakeBridge with default config."""
+    return FakeBridge()
+
+
 # ========== Formatting helpers ==========
 
 
@@ -91,25 +98,22 @@ def test_humanize_enum_value_preserves_paths():
     assert BridgeInterface._humanize_enum_value("ls -la") == "ls -la"
 
 
-def test_format_tool_input_markdown_string():
+def test_format_tool_input_markdown_string(bridge):
     """Test format_tool_input_markdown with plain text."""
-    bridge = FakeBridge()
     result = bridge.format_tool_input_markdown("plain text")
     assert "plain text" in result
 
 
-def test_format_tool_input_markdown_json():
+def test_format_tool_input_markdown_json(bridge):
     """Test format_tool_input_markdown with JSON dictionary."""
-    bridge = FakeBridge()
     result = bridge.format_tool_input_markdown('{"command": "ls -la", "path": "/tmp"}')
     assert "command" in result or "Command" in result
     assert "ls -la" in result
     assert "/tmp" in result
 
 
-def test_format_tool_input_markdown_truncate():
+def test_format_tool_input_markdown_truncate(bridge):
     """Test format_tool_input_markdown truncates long values."""
-    bridge = FakeBridge()
     long_value = "x" * 500
     result = bridge.format_tool_input_markdown(f'{{"data": "{long_value}"}}', truncate=100)
     assert "..." in result
@@ -119,9 +123,8 @@ def test_format_tool_input_markdown_truncate():
 # ========== Approval text parsing ==========
 
 
-def test_parse_approval_allow():
+def test_parse_approval_allow(bridge):
     """Test parsing basic allow commands."""
-    bridge = FakeBridge()
     assert bridge.parse_approval_text("allow") == {
         "allow": True,
         "reason": None,
@@ -139,9 +142,8 @@ def test_parse_approval_allow():
     }
 
 
-def test_parse_approval_deny():
+def test_parse_approval_deny(bridge):
     """Test parsing basic deny commands."""
-    bridge = FakeBridge()
     assert bridge.parse_approval_text("deny") == {
         "allow": False,
         "reason": None,
@@ -159,9 +161,8 @@ def test_parse_approval_deny():
     }
 
 
-def test_parse_approval_deny_with_reason():
+def test_parse_approval_deny_with_reason(bridge):
     """Test parsing deny commands with reasons."""
-    bridge = FakeBridge()
     result = bridge.parse_approval_text("deny: too risky")
     assert result == {"allow": False, "reason": "too risky", "timer": None}
 
@@ -172,9 +173,8 @@ def test_parse_approval_deny_with_reason():
     assert result == {"allow": False, "reason": "testing purposes", "timer": None}
 
 
-def test_parse_approval_allow_all():
+def test_parse_approval_allow_all(bridge):
     """Test parsing allow all timer command."""
-    bridge = FakeBridge()
     assert bridge.parse_approval_text("allow all") == {
         "allow": True,
         "reason": None,
@@ -182,9 +182,8 @@ def test_parse_approval_allow_all():
     }
 
 
-def test_parse_approval_allow_dir():
+def test_parse_approval_allow_dir(bridge):
     """Test parsing allow dir timer command."""
-    bridge = FakeBridge()
     assert bridge.parse_approval_text("allow dir") == {
         "allow": True,
         "reason": None,
@@ -192,9 +191,8 @@ def test_parse_approval_allow_dir():
     }
 
 
-def test_parse_approval_allow_tool():
+def test_parse_approval_allow_tool(bridge):
     """Test parsing allow tool timer command."""
-    bridge = FakeBridge()
     result = bridge.parse_approval_text("allow Bash")
     assert result == {"allow": True, "reason": None, "timer": "Bash"}
 
@@ -202,9 +200,8 @@ def test_parse_approval_allow_tool():
     assert result == {"allow": True, "reason": None, "timer": "Write"}
 
 
-def test_parse_approval_synonyms():
+def test_parse_approval_synonyms(bridge):
     """Test parsing approval synonyms."""
-    bridge = FakeBridge()
     assert bridge.parse_approval_text("proceed") == {
         "allow": True,
         "reason": None,
@@ -222,9 +219,8 @@ def test_parse_approval_synonyms():
     }
 
 
-def test_parse_approval_unrecognized():
+def test_parse_approval_unrecognized(bridge):
     """Test parsing unrecognized text returns None."""
-    bridge = FakeBridge()
     assert bridge.parse_approval_text("random text") is None
     assert bridge.parse_approval_text("maybe") is None
     assert bridge.parse_approval_text("") is None
@@ -233,9 +229,8 @@ def test_parse_approval_unrecognized():
 # ========== Choice text parsing ==========
 
 
-def test_parse_choice_numeric():
+def test_parse_choice_numeric(bridge):
     """Test parsing numeric choice selection (1-indexed)."""
-    bridge = FakeBridge()
     request = ApprovalRequest(
         kind="choice",
         request_id="req_1",
@@ -243,15 +238,14 @@ def test_parse_choice_numeric():
         description="Where to deploy?",
         options=["staging", "production"],
     )
-    bridge._pending_permissions["sess_1"] = request
+    bridge.set_pending_permission("sess_1", request)
 
     assert bridge.parse_choice_text("sess_1", "1") == "staging"
     assert bridge.parse_choice_text("sess_1", "2") == "production"
 
 
-def test_parse_choice_label():
+def test_parse_choice_label(bridge):
     """Test parsing choice by label (case-insensitive)."""
-    bridge = FakeBridge()
     request = ApprovalRequest(
         kind="choice",
         request_id="req_1",
@@ -259,22 +253,20 @@ def test_parse_choice_label():
         description="Where to deploy?",
         options=["staging", "production"],
     )
-    bridge._pending_permissions["sess_1"] = request
+    bridge.set_pending_permission("sess_1", request)
 
     assert bridge.parse_choice_text("sess_1", "staging") == "staging"
     assert bridge.parse_choice_text("sess_1", "PRODUCTION") == "production"
     assert bridge.parse_choice_text("sess_1", "Staging") == "staging"
 
 
-def test_parse_choice_no_pending():
+def test_parse_choice_no_pending(bridge):
     """Test parsing choice with no pending choice request."""
-    bridge = FakeBridge()
     assert bridge.parse_choice_text("sess_1", "1") is None
 
 
-def test_parse_choice_wrong_kind():
+def test_parse_choice_wrong_kind(bridge):
     """Test parsing choice when pending request is not a choice."""
-    bridge = FakeBridge()
     request = ApprovalRequest(
         kind="permission",
         request_id="req_1",
@@ -282,14 +274,13 @@ def test_parse_choice_wrong_kind():
         description="ls -la",
         options=[],
     )
-    bridge._pending_permissions["sess_1"] = request
+    bridge.set_pending_permission("sess_1", request)
 
     assert bridge.parse_choice_text("sess_1", "1") is None
 
 
-def test_parse_choice_out_of_range():
+def test_parse_choice_out_of_range(bridge):
     """Test parsing numeric choice out of range."""
-    bridge = FakeBridge()
     request = ApprovalRequest(
         kind="choice",
         request_id="req_1",
@@ -297,15 +288,14 @@ def test_parse_choice_out_of_range():
         description="Where to deploy?",
         options=["staging", "production"],
     )
-    bridge._pending_permissions["sess_1"] = request
+    bridge.set_pending_permission("sess_1", request)
 
     assert bridge.parse_choice_text("sess_1", "0") is None
     assert bridge.parse_choice_text("sess_1", "3") is None
 
 
-def test_parse_choice_invalid_label():
+def test_parse_choice_invalid_label(bridge):
     """Test parsing choice with invalid label."""
-    bridge = FakeBridge()
     request = ApprovalRequest(
         kind="choice",
         request_id="req_1",
@@ -313,7 +303,7 @@ def test_parse_choice_invalid_label():
         description="Where to deploy?",
         options=["staging", "production"],
     )
-    bridge._pending_permissions["sess_1"] = request
+    bridge.set_pending_permission("sess_1", request)
 
     assert bridge.parse_choice_text("sess_1", "invalid") is None
 
@@ -321,9 +311,8 @@ def test_parse_choice_invalid_label():
 # ========== Auto-approve logic ==========
 
 
-def test_set_allow_all():
+def test_set_allow_all(bridge):
     """Test setting allow-all timer."""
-    bridge = FakeBridge()
     bridge.set_allow_all("sess_1")
 
     result = bridge.check_auto_approve("sess_1", "Bash")
@@ -333,18 +322,16 @@ def test_set_allow_all():
     assert result == "Allow All"
 
 
-def test_set_allow_tool():
+def test_set_allow_tool(bridge):
     """Test setting tool-specific timer."""
-    bridge = FakeBridge()
     bridge.set_allow_tool("sess_1", "Bash")
 
     assert bridge.check_auto_approve("sess_1", "Bash") == "Allow Bash"
     assert bridge.check_auto_approve("sess_1", "Read") is None
 
 
-def test_allow_all_overrides_tool():
+def test_allow_all_overrides_tool(bridge):
     """Test allow-all takes precedence over tool timer."""
-    bridge = FakeBridge()
     bridge.set_allow_tool("sess_1", "Bash")
     bridge.set_allow_all("sess_1")
 
@@ -352,9 +339,8 @@ def test_allow_all_overrides_tool():
     assert bridge.check_auto_approve("sess_1", "Bash") == "Allow All"
 
 
-def test_never_auto_approve_tools():
+def test_never_auto_approve_tools(bridge):
     """Test tools in _NEVER_AUTO_APPROVE are never auto-approved."""
-    bridge = FakeBridge()
     bridge.set_allow_all("sess_1")
 
     assert bridge.check_auto_approve("sess_1", "task") is None
@@ -363,18 +349,29 @@ def test_never_auto_approve_tools():
     assert bridge.check_auto_approve("sess_1", "exitplanmode") is None
 
 
-def test_never_auto_approve_case_insensitive():
+def test_never_auto_approve_case_insensitive(bridge):
     """Test _NEVER_AUTO_APPROVE is case-insensitive."""
-    bridge = FakeBridge()
     bridge.set_allow_all("sess_1")
 
     assert bridge.check_auto_approve("sess_1", "TASK") is None
     assert bridge.check_auto_approve("sess_1", "EnterPlanMode") is None
 
 
-def test_set_allow_directory():
+def test_never_auto_approve_plain_set_override():
+    """Test a subclass can still override _NEVER_AUTO_APPROVE with a plain set."""
+
+    class SetOverrideBridge(FakeBridge):
+        _NEVER_AUTO_APPROVE = {"bash"}
+
+    bridge = SetOverrideBridge()
+    bridge.set_allow_all("sess_1")
+
+    assert bridge.check_auto_approve("sess_1", "Bash") is None
+    assert bridge.check_auto_approve("sess_1", "Read") == "Allow All"
+
+
+def test_set_allow_directory(bridge):
     """Test setting directory-scoped timer."""
-    bridge = FakeBridge()
 
     def get_session_dir(session_id: str) -> str | None:
         if session_id == "sess_1":
@@ -402,17 +399,15 @@ def test_set_allow_directory():
     assert bridge.check_auto_approve("sess_3", "Bash") is None
 
 
-def test_auto_approve_expiry():
+def test_auto_approve_expiry(bridge):
     """Test auto-approve timers expire."""
-    bridge = FakeBridge()
-    bridge._allow_all_until["sess_1"] = time.time() - 1  # Expired 1 second ago
+    bridge._session_state("sess_1").allow_all_until = time.monotonic() - 1  # Expired 1 second ago
 
     assert bridge.check_auto_approve("sess_1", "Bash") is None
 
 
-def test_auto_approve_different_sessions():
+def test_auto_approve_different_sessions(bridge):
     """Test auto-approve is session-scoped."""
-    bridge = FakeBridge()
     bridge.set_allow_all("sess_1")
 
     assert bridge.check_auto_approve("sess_1", "Bash") == "Allow All"
@@ -434,7 +429,7 @@ def test_should_send_error_debounce():
 
     # First error sent
     assert bridge._should_send_error_status("sess_1") is True
-    bridge._last_error_status_sent_at["sess_1"] = time.time()
+    bridge._session_state("sess_1").last_error_sent_at = time.monotonic()
 
     # Immediate error suppressed
     assert bridge._should_send_error_status("sess_1") is False
@@ -446,7 +441,7 @@ def test_should_send_error_after_window():
 
     # First error sent
     assert bridge._should_send_error_status("sess_1") is True
-    bridge._last_error_status_sent_at["sess_1"] = time.time() - 2  # 2 seconds ago
+    bridge._session_state("sess_1").last_error_sent_at = time.monotonic() - 2  # 2 seconds ago
 
     # After window, error is sent
     assert bridge._should_send_error_status("sess_1") is True
@@ -457,16 +452,15 @@ def test_should_send_error_disabled():
     bridge = FakeBridge(config=BridgeConfig(error_debounce_seconds=0))
 
     assert bridge._should_send_error_status("sess_1") is True
-    bridge._last_error_status_sent_at["sess_1"] = time.time()
+    bridge._session_state("sess_1").last_error_sent_at = time.monotonic()
     assert bridge._should_send_error_status("sess_1") is True
 
 
 # ========== Pending permissions ==========
 
 
-def test_set_and_get_pending_permission():
+def test_set_and_get_pending_permission(bridge):
     """Test setting and getting pending permissions."""
-    bridge = FakeBridge()
     request = ApprovalRequest(
         request_id="req_1",
         title="Bash",
@@ -482,9 +476,8 @@ def test_set_and_get_pending_permission():
     assert retrieved.title == "Bash"
 
 
-def test_clear_pending_permission():
+def test_clear_pending_permission(bridge):
     """Test clearing pending permissions."""
-    bridge = FakeBridge()
     request = ApprovalRequest(
         request_id="req_1",
         title="Bash",
@@ -499,9 +492,8 @@ def test_clear_pending_permission():
 
 
 @pytest.mark.asyncio
-async def test_on_session_removed():
+async def test_on_session_removed(bridge):
     """Test on_session_removed clears all session state."""
-    bridge = FakeBridge()
 
     # Set up various state for sess_1
     bridge.set_allow_all("sess_1")
@@ -513,7 +505,8 @@ async def test_on_session_removed():
         options=[],
     )
     bridge.set_pending_permission("sess_1", request)
-    bridge._last_error_status_sent_at["sess_1"] = time.time()
+    bridge._session_state("sess_1").last_error_sent_at = time.monotonic()
+    bridge.buffer_auto_approve_notification("sess_1", "Read", "Allow All")
 
     # Remove session
     await bridge.on_session_removed("sess_1")
@@ -521,35 +514,51 @@ async def test_on_session_removed():
     # All state should be cleared
     assert bridge.check_auto_approve("sess_1", "Bash") is None
     assert bridge.get_pending_permission("sess_1") is None
-    assert "sess_1" not in bridge._last_error_status_sent_at
+    assert "sess_1" not in bridge._sessions
+    assert "sess_1" not in bridge._auto_approve_flush_tasks
 
 
 # ========== Auto-approve batching ==========
 
 
 @pytest.mark.asyncio
-async def test_buffer_auto_approve_notification():
+async def test_buffer_auto_approve_notification(bridge):
     """Test auto-approve notifications are buffered."""
-    bridge = FakeBridge()
 
     # Buffer some notifications
     bridge.buffer_auto_approve_notification("sess_1", "Bash", "Allow All")
     bridge.buffer_auto_approve_notification("sess_1", "Read", "Allow All")
 
     # Check buffer was populated (before flush)
-    assert len(bridge._auto_approve_buffer.get("sess_1", [])) == 2
-    assert bridge._auto_approve_buffer["sess_1"] == [
+    assert len(bridge._sessions["sess_1"].auto_approve_buffer) == 2
+    assert bridge._sessions["sess_1"].auto_approve_buffer == [
         ("Bash", "Allow All"),
         ("Read", "Allow All"),
     ]
 
+    # Cancel the pending flush timer so it does not outlive the test
+    await bridge.on_session_removed("sess_1")
+
 
 @pytest.mark.asyncio
-async def test_buffer_auto_approve_single_item():
+async def test_buffer_auto_approve_single_item(bridge):
     """Test single auto-approve notification."""
-    bridge = FakeBridge()
 
     bridge.buffer_auto_approve_notification("sess_1", "Bash", "Allow All")
 
-    assert len(bridge._auto_approve_buffer.get("sess_1", [])) == 1
-    assert bridge._auto_approve_buffer["sess_1"] == [("Bash", "Allow All")]
+    assert len(bridge._sessions["sess_1"].auto_approve_buffer) == 1
+    assert bridge._sessions["sess_1"].auto_approve_buffer == [("Bash", "Allow All")]
+
+    await bridge.on_session_removed("sess_1")
+
+
+def test_approval_request_is_frozen_and_hashable():
+    """Test ApprovalRequest is immutable, hashable, and stores options as a tuple."""
+    a = ApprovalRequest(request_id="req_1", title="Bash", description="ls", options=["Allow"])
+    b = ApprovalRequest(request_id="req_1", title="Bash", description="ls", options=("Allow",))
+
+    assert a.options == ("Allow",)
+    assert a == b
+    assert {a: "x"}[b] == "x"
+    with pytest.raises(ValidationError):
+        a.title = "Read"
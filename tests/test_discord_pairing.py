@@ -1,6 +1,7 @@
 """Tests for Discord pairing state."""
 
 import json
+import stat
 
 import pytest
 
@@ -109,6 +110,20 @@ def test_save_and_reload(tmp_path):
     assert loaded.control_channel_id == 555
 
 
+def test_save_is_owner_only(tmp_path):
+    """Test the pairing file is only readable by its owner."""
+    path = tmp_path / "pairing.json"
+    state = DiscordPairingState(
+        pairing_code="87654321",
+        paired_user_ids=set(),
+        control_channel_id=None,
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+    save(path=path, state=state)
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
 def test_load_or_create_corrupt_file(tmp_path):
     """Test corrupt file results in fresh state."""
     path = tmp_path / "pairing.json"
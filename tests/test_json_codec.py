@@ -0,0 +1,127 @@
+"""Tests for json_codec dumps/loads."""
+
+import json
+import stat
+
+import pytest
+
+from agent_tether import json_codec
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    """Run each test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson not installed")
+    return json_codec
+
+
+def test_round_trip(codec):
+    """Test dumps/loads round-trip."""
+    data = {"b": [1, 2], "a": "é", "c": None}
+    assert codec.loads(codec.dumps(data)) == data
+
+
+def test_dumps_returns_bytes(codec):
+    """Test dumps returns UTF-8 bytes."""
+    assert isinstance(codec.dumps({"a": 1}), bytes)
+
+
+def test_pretty_matches_stdlib_layout(codec):
+    """Test pretty output matches json.dumps(indent=2) plus trailing newline."""
+    data = {"z": 1, "a": [1, 2]}
+    expected = json.dumps(data, indent=2, sort_keys=True) + "\n"
+    assert codec.dumps(data, pretty=True, sort_keys=True).decode() == expected
+
+
+def test_loads_accepts_str(codec):
+    """Test loads accepts str input."""
+    assert codec.loads('{"a": 1}') == {"a": 1}
+
+
+def test_loads_invalid_raises_value_error(codec):
+    """Test invalid JSON raises ValueError."""
+    with pytest.raises(ValueError):
+        codec.loads(b"not valid json {{{")
+
+
+def test_write_atomic_creates_parent_dirs(tmp_path):
+    """Test write_atomic creates missing parent directories."""
+    path = tmp_path / "nested" / "state.json"
+    json_codec.write_atomic(path, b'{"a": 1}')
+    assert path.read_bytes() == b'{"a": 1}'
+
+
+def test_write_atomic_replaces_and_leaves_no_temp_files(tmp_path):
+    """Test write_atomic overwrites the target without leaving temp files."""
+    path = tmp_path / "state.json"
+    path.write_bytes(b"old")
+    json_codec.write_atomic(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_write_atomic_failure_keeps_original(tmp_path, monkeypatch):
+    """Test a failed replace keeps the original file and removes the temp file."""
+    path = tmp_path / "state.json"
+    path.write_bytes(b"old")
+
+    def fail(src, dst):
+        raise OSError("boom")
+
+    monkeypatch.setattr(json_codec.os, "replace", fail)
+    with pytest.raises(OSError):
+        json_codec.write_atomic(path, b"new")
+
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_write_atomic_keeps_existing_mode(tmp_path):
+    """Test write_atomic keeps the permissions of the file it replaces."""
+    path = tmp_path / "state.json"
+    path.write_bytes(b"old")
+    path.chmod(0o640)
+    json_codec.write_atomic(path, b"new")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_write_atomic_new_file_uses_umask(tmp_path):
+    """Test a new file gets the same mode a plain open() would give it."""
+    plain = tmp_path / "plain.json"
+    plain.write_bytes(b"{}")
+    path = tmp_path / "state.json"
+    json_codec.write_atomic(path, b"{}")
+    assert stat.S_IMODE(path.stat().st_mode) == stat.S_IMODE(plain.stat().st_mode)
+
+
+@pytest.mark.parametrize("fsync, expected_calls", [(True, 1), (False, 0)])
+def test_write_atomic_fsync_switch(tmp_path, monkeypatch, fsync, expected_calls):
+    """Test write_atomic syncs the temp file only when asked to."""
+    calls = []
+    monkeypatch.setattr(json_codec.os, "fsync", calls.append)
+    path = tmp_path / "state.json"
+    json_codec.write_atomic(path, b"{}", fsync=fsync)
+    assert len(calls) == expected_calls
+    assert path.read_bytes() == b"{}"
+
+
+def test_write_atomic_leaves_umask_alone(tmp_path, monkeypatch):
+    """Test write_atomic never changes the process-wide umask."""
+
+    def fail(mask):
+        raise AssertionError("os.umask called")
+
+    monkeypatch.setattr(json_codec.os, "umask", fail)
+    json_codec.write_atomic(tmp_path / "state.json", b"{}")
+
+
+def test_write_atomic_explicit_mode(tmp_path):
+    """Test an explicit mode overrides the existing permissions."""
+    path = tmp_path / "state.json"
+    path.write_bytes(b"old")
+    path.chmod(0o644)
+    json_codec.write_atomic(path, b"new", mode=0o600)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
@@ -1,41 +1,39 @@
 """Tests for BridgeManager."""
 
+import asyncio
+
 import pytest
 
-from agent_tether.base import ApprovalRequest, BridgeInterface, BridgeConfig
+from agent_tether.base import ApprovalRequest
 from agent_tether.manager import BridgeManager
+from tests.helpers import RecordingBridge
 
+# ApprovalRequest is frozen, so tests can share one instance.
+_SAMPLE_APPROVAL = ApprovalRequest(
+    request_id="req_1",
+    title="Bash",
+    description="ls -la",
+    options=(),
+)
 
-class MockBridge(BridgeInterface):
-    """Mock bridge for testing."""
-
-    def __init__(self, name: str):
-        super().__init__(BridgeConfig())
-        self.name = name
-        self.outputs = []
-        self.approvals = []
-        self.statuses = []
-        self.threads = []
-
-    async def on_output(self, session_id: str, text: str, metadata=None):
-        self.outputs.append((session_id, text, metadata))
 
-    async def on_approval_request(self, session_id: str, request: ApprovalRequest):
-        self.approvals.append((session_id, request))
+@pytest.fixture
+def manager():
+    """An empty BridgeManager."""
+    return BridgeManager()
 
-    async def on_status_change(self, session_id: str, status: str, metadata=None):
-        self.statuses.append((session_id, status, metadata))
 
-    async def create_thread(self, session_id: str, session_name: str) -> dict:
-        thread_id = f"{self.name}_thread_{len(self.threads)}"
-        self.threads.append((session_id, session_name, thread_id))
-        return {"thread_id": thread_id, "platform": self.name}
+@pytest.fixture
+def telegram(manager):
+    """A RecordingBridge registered with ``manager`` as "telegram"."""
+    bridge = RecordingBridge("telegram")
+    manager.register_bridge("telegram", bridge)
+    return bridge
 
 
-def test_register_and_get_bridge():
+def test_register_and_get_bridge(manager):
     """Test registering and retrieving bridges."""
-    manager = BridgeManager()
-    bridge = MockBridge("telegram")
+    bridge = RecordingBridge("telegram")
 
     manager.register_bridge("telegram", bridge)
 
@@ -43,34 +41,30 @@ def test_register_and_get_bridge():
     assert retrieved is bridge
 
 
-def test_get_bridge_unknown():
+def test_get_bridge_unknown(manager):
     """Test get_bridge returns None for unknown platform."""
-    manager = BridgeManager()
     assert manager.get_bridge("unknown") is None
 
 
-def test_list_bridges_empty():
+def test_list_bridges_empty(manager):
     """Test list_bridges with no bridges."""
-    manager = BridgeManager()
     assert manager.list_bridges() == []
 
 
-def test_list_bridges():
+def test_list_bridges(manager):
     """Test list_bridges returns registered platforms."""
-    manager = BridgeManager()
-    manager.register_bridge("telegram", MockBridge("telegram"))
-    manager.register_bridge("slack", MockBridge("slack"))
-    manager.register_bridge("discord", MockBridge("discord"))
+    manager.register_bridge("telegram", RecordingBridge("telegram"))
+    manager.register_bridge("slack", RecordingBridge("slack"))
+    manager.register_bridge("discord", RecordingBridge("discord"))
 
     platforms = manager.list_bridges()
     assert set(platforms) == {"telegram", "slack", "discord"}
 
 
-def test_register_multiple_bridges():
+def test_register_multiple_bridges(manager):
     """Test registering multiple bridges."""
-    manager = BridgeManager()
-    telegram = MockBridge("telegram")
-    slack = MockBridge("slack")
+    telegram = RecordingBridge("telegram")
+    slack = RecordingBridge("slack")
 
     manager.register_bridge("telegram", telegram)
     manager.register_bridge("slack", slack)
@@ -79,11 +73,10 @@ def test_register_multiple_bridges():
     assert manager.get_bridge("slack") is slack
 
 
-def test_register_overwrites():
+def test_register_overwrites(manager):
     """Test registering a bridge twice overwrites the first."""
-    manager = BridgeManager()
-    bridge1 = MockBridge("telegram_v1")
-    bridge2 = MockBridge("telegram_v2")
+    bridge1 = RecordingBridge("telegram_v1")
+    bridge2 = RecordingBridge("telegram_v2")
 
     manager.register_bridge("telegram", bridge1)
     manager.register_bridge("telegram", bridge2)
@@ -92,138 +85,97 @@ def test_register_overwrites():
 
 
 @pytest.mark.asyncio
-async def test_route_output():
+async def test_route_output(manager):
     """Test routing output to the correct bridge."""
-    manager = BridgeManager()
-    telegram = MockBridge("telegram")
-    slack = MockBridge("slack")
+    telegram = RecordingBridge("telegram")
+    slack = RecordingBridge("slack")
 
     manager.register_bridge("telegram", telegram)
     manager.register_bridge("slack", slack)
 
-    await manager.route_output("sess_1", "Hello from Telegram", "telegram")
-    await manager.route_output("sess_2", "Hello from Slack", "slack")
+    await asyncio.gather(
+        manager.route_output("sess_1", "Hello from Telegram", "telegram"),
+        manager.route_output("sess_2", "Hello from Slack", "slack"),
+    )
 
-    assert len(telegram.outputs) == 1
-    assert telegram.outputs[0] == ("sess_1", "Hello from Telegram", None)
+    assert len(telegram.events["output"]) == 1
+    assert telegram.events["output"][0] == ("sess_1", "Hello from Telegram", None)
 
-    assert len(slack.outputs) == 1
-    assert slack.outputs[0] == ("sess_2", "Hello from Slack", None)
+    assert len(slack.events["output"]) == 1
+    assert slack.events["output"][0] == ("sess_2", "Hello from Slack", None)
 
 
 @pytest.mark.asyncio
-async def test_route_output_with_metadata():
+async def test_route_output_with_metadata(manager, telegram):
     """Test routing output with metadata."""
-    manager = BridgeManager()
-    bridge = MockBridge("telegram")
-    manager.register_bridge("telegram", bridge)
-
     metadata = {"stream": "stdout", "final": True}
     await manager.route_output("sess_1", "Output text", "telegram", metadata)
 
-    assert len(bridge.outputs) == 1
-    assert bridge.outputs[0] == ("sess_1", "Output text", metadata)
+    assert len(telegram.events["output"]) == 1
+    assert telegram.events["output"][0] == ("sess_1", "Output text", metadata)
 
 
 @pytest.mark.asyncio
-async def test_route_output_unknown_platform():
+async def test_route_output_unknown_platform(manager):
     """Test routing output to unknown platform doesn't raise."""
-    manager = BridgeManager()
-
     # Should not raise, just log warning
     await manager.route_output("sess_1", "Message", "unknown")
 
 
 @pytest.mark.asyncio
-async def test_route_approval():
+async def test_route_approval(manager, telegram):
     """Test routing approval request to the correct bridge."""
-    manager = BridgeManager()
-    telegram = MockBridge("telegram")
-    manager.register_bridge("telegram", telegram)
-
-    request = ApprovalRequest(
-        request_id="req_1",
-        title="Bash",
-        description="ls -la",
-        options=[],
-    )
-
-    await manager.route_approval("sess_1", request, "telegram")
+    await manager.route_approval("sess_1", _SAMPLE_APPROVAL, "telegram")
 
-    assert len(telegram.approvals) == 1
-    assert telegram.approvals[0] == ("sess_1", request)
+    assert len(telegram.events["approval"]) == 1
+    assert telegram.events["approval"][0] == ("sess_1", _SAMPLE_APPROVAL)
 
 
 @pytest.mark.asyncio
-async def test_route_approval_unknown_platform():
+async def test_route_approval_unknown_platform(manager):
     """Test routing approval to unknown platform doesn't raise."""
-    manager = BridgeManager()
-
-    request = ApprovalRequest(
-        request_id="req_1",
-        title="Bash",
-        description="ls -la",
-        options=[],
-    )
-
     # Should not raise, just log warning
-    await manager.route_approval("sess_1", request, "unknown")
+    await manager.route_approval("sess_1", _SAMPLE_APPROVAL, "unknown")
 
 
 @pytest.mark.asyncio
-async def test_route_status():
+async def test_route_status(manager, telegram):
     """Test routing status change to the correct bridge."""
-    manager = BridgeManager()
-    bridge = MockBridge("telegram")
-    manager.register_bridge("telegram", bridge)
-
     await manager.route_status("sess_1", "running", "telegram")
 
-    assert len(bridge.statuses) == 1
-    assert bridge.statuses[0] == ("sess_1", "running", None)
+    assert len(telegram.events["status"]) == 1
+    assert telegram.events["status"][0] == ("sess_1", "running", None)
 
 
 @pytest.mark.asyncio
-async def test_route_status_with_metadata():
+async def test_route_status_with_metadata(manager, telegram):
     """Test routing status with metadata."""
-    manager = BridgeManager()
-    bridge = MockBridge("telegram")
-    manager.register_bridge("telegram", bridge)
-
     metadata = {"error": "Connection failed"}
     await manager.route_status("sess_1", "error", "telegram", metadata)
 
-    assert len(bridge.statuses) == 1
-    assert bridge.statuses[0] == ("sess_1", "error", metadata)
+    assert len(telegram.events["status"]) == 1
+    assert telegram.events["status"][0] == ("sess_1", "error", metadata)
 
 
 @pytest.mark.asyncio
-async def test_route_status_unknown_platform():
+async def test_route_status_unknown_platform(manager):
     """Test routing status to unknown platform doesn't raise."""
-    manager = BridgeManager()
-
     # Should not raise, just log warning
     await manager.route_status("sess_1", "running", "unknown")
 
 
 @pytest.mark.asyncio
-async def test_create_thread():
+async def test_create_thread(manager, telegram):
     """Test creating a thread on a platform."""
-    manager = BridgeManager()
-    bridge = MockBridge("telegram")
-    manager.register_bridge("telegram", bridge)
-
     result = await manager.create_thread("sess_1", "My Session", "telegram")
 
     assert result == {"thread_id": "telegram_thread_0", "platform": "telegram"}
-    assert len(bridge.threads) == 1
-    assert bridge.threads[0] == ("sess_1", "My Session", "telegram_thread_0")
+    assert len(telegram.events["thread"]) == 1
+    assert telegram.events["thread"][0] == ("sess_1", "My Session", "telegram_thread_0")
 
 
 @pytest.mark.asyncio
-async def test_create_thread_unknown_platform():
+async def test_create_thread_unknown_platform(manager):
     """Test creating thread on unknown platform raises ValueError."""
-    manager = BridgeManager()
-
     with pytest.raises(ValueError, match="No bridge registered for platform: unknown"):
         await manager.create_thread("sess_1", "My Session", "unknown")
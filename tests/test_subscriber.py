@@ -5,44 +5,25 @@ import json
 
 import pytest
 
-from agent_tether.base import ApprovalRequest, BridgeConfig, BridgeInterface
 from agent_tether.manager import BridgeManager
-from agent_tether.subscriber import BridgeSubscriber, _OUTPUT_FLUSH_DELAY_S
+from agent_tether import subscriber as subscriber_module
+from agent_tether.subscriber import BridgeSubscriber
+from tests.helpers import RecordingBridge
 
+_FINAL_METADATA = {"final": True, "kind": "final"}
 
-class FakeBridge(BridgeInterface):
-    """Fake bridge that records all calls."""
 
-    def __init__(self):
-        super().__init__(BridgeConfig())
-        self.outputs: list[tuple[str, str]] = []
-        self.approvals: list[tuple[str, ApprovalRequest]] = []
-        self.statuses: list[tuple[str, str, dict | None]] = []
-        self.typing_started: list[str] = []
-        self.typing_stopped: list[str] = []
-        self.sessions_removed: list[str] = []
-
-    async def on_output(self, session_id, text, metadata=None):
-        self.outputs.append((session_id, text))
-
-    async def on_approval_request(self, session_id, request):
-        self.approvals.append((session_id, request))
+def _output(text, **data):
+    return {"type": "output", "data": {"text": text, **data}}
 
-    async def on_status_change(self, session_id, status, metadata=None):
-        self.statuses.append((session_id, status, metadata))
 
-    async def on_typing(self, session_id):
-        self.typing_started.append(session_id)
+def _state(state):
+    return {"type": "session_state", "data": {"state": state}}
 
-    async def on_typing_stopped(self, session_id):
-        self.typing_stopped.append(session_id)
 
-    async def on_session_removed(self, session_id):
-        self.sessions_removed.append(session_id)
-        await super().on_session_removed(session_id)
-
-    async def create_thread(self, session_id, session_name):
-        return {"thread_id": f"thread_{session_id}"}
+# The subscriber never mutates events, so tests can enqueue shared constants.
+_AWAITING_INPUT = _state("AWAITING_INPUT")
+_CONNECTION_LOST = {"type": "error", "data": {"message": "Connection lost"}}
 
 
 class FakeStore:
@@ -64,37 +45,52 @@ class FakeStore:
                 pass
 
 
-def _make_subscriber():
-    """Create a BridgeSubscriber with a fake bridge and store."""
-    bridge = FakeBridge()
+@pytest.fixture
+def bridge():
+    """The bridge registered as platform "test"."""
+    return RecordingBridge()
+
+
+@pytest.fixture
+async def subscriber(bridge):
+    """A BridgeSubscriber routing to ``bridge`` as platform "test".
+
+    Any session still subscribed when the test ends is unsubscribed, so a
+    failing assertion cannot leak consumer tasks into the shared session
+    event loop. Teardown then checks that nothing was left running.
+    """
+    tasks_before = asyncio.all_tasks()
     manager = BridgeManager()
     manager.register_bridge("test", bridge)
     store = FakeStore()
-    subscriber = BridgeSubscriber(manager, store.new_subscriber, store.remove_subscriber)
-    return subscriber, bridge, store
+    sub = BridgeSubscriber(manager, store.new_subscriber, store.remove_subscriber)
+    yield sub
+    for session_id in list(sub._tasks):
+        await sub.unsubscribe(session_id, platform="test")
+    await asyncio.sleep(0)  # let cancelled tasks finish
+    assert asyncio.all_tasks() - tasks_before - {asyncio.current_task()} == set()
+
+
+async def _drain(queue: asyncio.Queue) -> None:
+    """Wait until the consumer has routed every event put on the queue."""
+    await asyncio.wait_for(queue.join(), timeout=1.0)
 
 
 # ========== Lifecycle ==========
 
 
 @pytest.mark.asyncio
-async def test_subscribe_creates_task():
+async def test_subscribe_creates_task(subscriber):
     """Test subscribe creates a background task."""
-    subscriber, bridge, store = _make_subscriber()
-
     subscriber.subscribe("sess_1", "test")
 
     assert "sess_1" in subscriber._tasks
     assert "sess_1" in subscriber._queues
 
-    await subscriber.unsubscribe("sess_1", platform="test")
-
 
 @pytest.mark.asyncio
-async def test_subscribe_idempotent():
+async def test_subscribe_idempotent(subscriber):
     """Test subscribing twice is a no-op."""
-    subscriber, bridge, store = _make_subscriber()
-
     subscriber.subscribe("sess_1", "test")
     task1 = subscriber._tasks["sess_1"]
 
@@ -103,14 +99,10 @@ async def test_subscribe_idempotent():
 
     assert task1 is task2
 
-    await subscriber.unsubscribe("sess_1", platform="test")
-
 
 @pytest.mark.asyncio
-async def test_unsubscribe_cancels_and_cleans():
+async def test_unsubscribe_cancels_and_cleans(subscriber, bridge):
     """Test unsubscribe cancels task and calls on_session_removed."""
-    subscriber, bridge, store = _make_subscriber()
-
     subscriber.subscribe("sess_1", "test")
     assert "sess_1" in subscriber._tasks
 
@@ -118,219 +110,171 @@ async def test_unsubscribe_cancels_and_cleans():
 
     assert "sess_1" not in subscriber._tasks
     assert "sess_1" not in subscriber._queues
-    assert "sess_1" in bridge.sessions_removed
+    assert "sess_1" in bridge.events["session_removed"]
 
 
 @pytest.mark.asyncio
-async def test_unsubscribe_without_platform():
+async def test_unsubscribe_without_platform(subscriber, bridge):
     """Test unsubscribe without platform skips bridge cleanup."""
-    subscriber, bridge, store = _make_subscriber()
-
     subscriber.subscribe("sess_1", "test")
     await subscriber.unsubscribe("sess_1")
 
     assert "sess_1" not in subscriber._tasks
-    assert bridge.sessions_removed == []
+    assert bridge.events["session_removed"] == []
 
 
 # ========== Event routing ==========
 
 
-@pytest.mark.asyncio
-async def test_output_final_true():
-    """Test output event with final=True is forwarded immediately."""
-    subscriber, bridge, store = _make_subscriber()
+ROUTING_CASES = [
+    pytest.param(
+        [_output("Hello!", final=True)],
+        {"output": [("sess_1", "Hello!", _FINAL_METADATA)]},
+        id="output-final-forwarded",
+    ),
+    pytest.param(
+        [{"type": "output_final", "data": {"text": "Accumulated blob"}}],
+        {"output": []},
+        id="output_final-event-skipped",
+    ),
+    pytest.param(
+        [_output("", final=True)],
+        {"output": []},
+        id="empty-output-skipped",
+    ),
+    pytest.param(
+        [_output("Old message", final=True, is_history=True), _output("New message", final=True)],
+        {"output": [("sess_1", "New message", _FINAL_METADATA)]},
+        id="history-skipped",
+    ),
+    pytest.param(
+        [_state("RUNNING")],
+        {"typing_started": ["sess_1"]},
+        id="state-running",
+    ),
+    pytest.param(
+        [_AWAITING_INPUT],
+        {"typing_stopped": ["sess_1"]},
+        id="state-awaiting-input",
+    ),
+    pytest.param(
+        [_state("ERROR")],
+        {"typing_stopped": ["sess_1"], "status": [("sess_1", "error", None)]},
+        id="state-error",
+    ),
+    pytest.param(
+        [_CONNECTION_LOST],
+        {"status": [("sess_1", "error", {"message": "Connection lost"})]},
+        id="error-event",
+    ),
+]
+
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("events,expected", ROUTING_CASES)
+async def test_route_event(events, expected, subscriber, bridge):
+    """Test each event routes to the expected bridge calls."""
     subscriber.subscribe("sess_1", "test")
     queue = subscriber._queues["sess_1"]
 
-    queue.put_nowait({"type": "output", "data": {"text": "Hello!", "final": True}})
-    await asyncio.sleep(0.05)
-
-    assert ("sess_1", "Hello!") in bridge.outputs
+    for event in events:
+        queue.put_nowait(event)
+    await _drain(queue)
 
-    await subscriber.unsubscribe("sess_1", platform="test")
+    assert {kind: bridge.events[kind] for kind in expected} == expected
 
 
 @pytest.mark.asyncio
-async def test_output_step_buffered_and_flushed_on_timer():
+async def test_output_step_buffered_and_flushed_on_timer(monkeypatch, subscriber, bridge):
     """Test step output is buffered and flushed after the delay."""
-    subscriber, bridge, store = _make_subscriber()
-
+    # Shorten the real flush delay; _delayed_flush reads it at call time.
+    monkeypatch.setattr(subscriber_module, "_OUTPUT_FLUSH_DELAY_S", 0.05)
     subscriber.subscribe("sess_1", "test")
     queue = subscriber._queues["sess_1"]
 
-    queue.put_nowait({"type": "output", "data": {"text": "[tool: bash]\n", "final": False}})
-    queue.put_nowait({"type": "output", "data": {"text": "$ ls -la\n", "final": False}})
-    await asyncio.sleep(0.05)
+    queue.put_nowait(_output("[tool: bash]\n", final=False))
+    queue.put_nowait(_output("$ ls -la\n", final=False))
+    await _drain(queue)
 
     # Not yet flushed (timer hasn't fired)
-    assert bridge.outputs == []
+    assert bridge.events["output"] == []
 
     # Wait for flush timer
-    await asyncio.sleep(_OUTPUT_FLUSH_DELAY_S + 0.2)
+    await bridge.wait_for("output")
 
     # Now should be flushed as a single concatenated message
-    assert len(bridge.outputs) == 1
-    assert bridge.outputs[0] == ("sess_1", "[tool: bash]\n$ ls -la\n")
-
-    await subscriber.unsubscribe("sess_1", platform="test")
+    assert len(bridge.events["output"]) == 1
+    assert bridge.events["output"][0] == ("sess_1", "[tool: bash]\n$ ls -la\n", None)
+
+
+_WRITE_PERMISSION = {
+    "type": "permission_request",
+    "data": {
+        "request_id": "req_1",
+        "tool_name": "Write",
+        "tool_input": {"path": "/tmp/test"},
+    },
+}
+
+_STEP_OUTPUT = ("sess_1", "Step output\n", None)
+
+FLUSH_TRIGGER_CASES = [
+    pytest.param(_AWAITING_INPUT, [_STEP_OUTPUT], {"typing_stopped": 1}, id="awaiting-input"),
+    pytest.param(
+        _output("Final answer", final=True),
+        [_STEP_OUTPUT, ("sess_1", "Final answer", _FINAL_METADATA)],
+        {},
+        id="final-output",
+    ),
+    pytest.param(_WRITE_PERMISSION, [_STEP_OUTPUT], {"approval": 1}, id="permission-request"),
+    pytest.param(_CONNECTION_LOST, [_STEP_OUTPUT], {"status": 1}, id="error"),
+]
 
 
 @pytest.mark.asyncio
-async def test_output_step_flushed_on_state_change():
-    """Test buffered step output is flushed when state changes to AWAITING_INPUT."""
-    subscriber, bridge, store = _make_subscriber()
-
+@pytest.mark.parametrize("trigger,expected_outputs,expected_counts", FLUSH_TRIGGER_CASES)
+async def test_output_step_flushed_before_trigger(
+    trigger, expected_outputs, expected_counts, subscriber, bridge
+):
+    """Test buffered step output is flushed before the triggering event is handled."""
     subscriber.subscribe("sess_1", "test")
     queue = subscriber._queues["sess_1"]
 
-    queue.put_nowait({"type": "output", "data": {"text": "Step output\n", "final": False}})
-    await asyncio.sleep(0.05)
+    queue.put_nowait(_output("Step output\n", final=False))
+    await _drain(queue)
 
     # Not yet flushed
-    assert bridge.outputs == []
-
-    # State change flushes buffer
-    queue.put_nowait({"type": "session_state", "data": {"state": "AWAITING_INPUT"}})
-    await asyncio.sleep(0.05)
-
-    assert len(bridge.outputs) == 1
-    assert bridge.outputs[0] == ("sess_1", "Step output\n")
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_output_step_flushed_before_final():
-    """Test buffered step output is flushed before final output is sent."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
+    assert bridge.events["output"] == []
 
-    queue.put_nowait({"type": "output", "data": {"text": "[tool: bash]\n", "final": False}})
-    await asyncio.sleep(0.05)
-    queue.put_nowait({"type": "output", "data": {"text": "Final answer", "final": True}})
-    await asyncio.sleep(0.05)
+    queue.put_nowait(trigger)
+    await _drain(queue)
 
-    # Both step buffer and final should be delivered, in order
-    assert len(bridge.outputs) == 2
-    assert bridge.outputs[0] == ("sess_1", "[tool: bash]\n")
-    assert bridge.outputs[1] == ("sess_1", "Final answer")
-
-    await subscriber.unsubscribe("sess_1", platform="test")
+    # Step output goes out first, then whatever the trigger produces
+    assert bridge.events["output"] == expected_outputs
+    assert {kind: len(bridge.events[kind]) for kind in expected_counts} == expected_counts
 
 
 @pytest.mark.asyncio
-async def test_output_step_flushed_on_permission_request():
-    """Test buffered step output is flushed before a permission request."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
-
-    queue.put_nowait({"type": "output", "data": {"text": "[tool: write]\n", "final": False}})
-    await asyncio.sleep(0.05)
-    queue.put_nowait(
-        {
-            "type": "permission_request",
-            "data": {
-                "request_id": "req_1",
-                "tool_name": "Write",
-                "tool_input": {"path": "/tmp/test"},
-            },
-        }
-    )
-    await asyncio.sleep(0.05)
-
-    # Step output flushed, then approval request delivered
-    assert len(bridge.outputs) == 1
-    assert bridge.outputs[0] == ("sess_1", "[tool: write]\n")
-    assert len(bridge.approvals) == 1
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_output_step_flushed_on_error():
-    """Test buffered step output is flushed on error events."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
-
-    queue.put_nowait({"type": "output", "data": {"text": "Working...\n", "final": False}})
-    await asyncio.sleep(0.05)
-    queue.put_nowait({"type": "error", "data": {"message": "Connection lost"}})
-    await asyncio.sleep(0.05)
-
-    assert len(bridge.outputs) == 1
-    assert bridge.outputs[0] == ("sess_1", "Working...\n")
-    assert len(bridge.statuses) == 1
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_output_step_flushed_on_unsubscribe():
+async def test_output_step_flushed_on_unsubscribe(subscriber, bridge):
     """Test buffered output is flushed when unsubscribing."""
-    subscriber, bridge, store = _make_subscriber()
-
     subscriber.subscribe("sess_1", "test")
     queue = subscriber._queues["sess_1"]
 
-    queue.put_nowait({"type": "output", "data": {"text": "Buffered text\n", "final": False}})
-    await asyncio.sleep(0.05)
+    queue.put_nowait(_output("Buffered text\n", final=False))
+    await _drain(queue)
 
-    assert bridge.outputs == []
+    assert bridge.events["output"] == []
 
     await subscriber.unsubscribe("sess_1", platform="test")
 
     # Unsubscribe should flush remaining buffer
-    assert len(bridge.outputs) == 1
-    assert bridge.outputs[0] == ("sess_1", "Buffered text\n")
-
-    await subscriber.unsubscribe("sess_1", platform="test")
+    assert len(bridge.events["output"]) == 1
+    assert bridge.events["output"][0] == ("sess_1", "Buffered text\n", None)
 
 
 @pytest.mark.asyncio
-async def test_output_final_event_skipped():
-    """Test output_final event type is skipped (we use per-step events)."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
-
-    queue.put_nowait({"type": "output_final", "data": {"text": "Accumulated blob"}})
-    await asyncio.sleep(0.05)
-
-    assert bridge.outputs == []
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_empty_output_text_skipped():
-    """Test output with empty text is skipped."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
-
-    queue.put_nowait({"type": "output", "data": {"text": "", "final": True}})
-    await asyncio.sleep(0.05)
-
-    assert bridge.outputs == []
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_permission_request():
+async def test_permission_request(subscriber, bridge):
     """Test permission_request creates correct ApprovalRequest."""
-    subscriber, bridge, store = _make_subscriber()
-
     subscriber.subscribe("sess_1", "test")
     queue = subscriber._queues["sess_1"]
 
@@ -344,25 +288,21 @@ async def test_permission_request():
             },
         }
     )
-    await asyncio.sleep(0.05)
+    await _drain(queue)
 
-    assert len(bridge.approvals) == 1
-    session_id, request = bridge.approvals[0]
+    assert len(bridge.events["approval"]) == 1
+    session_id, request = bridge.events["approval"][0]
     assert session_id == "sess_1"
     assert request.kind == "permission"
     assert request.request_id == "req_1"
     assert request.title == "Bash"
     assert "ls -la" in request.description
-    assert request.options == ["Allow", "Deny"]
-
-    await subscriber.unsubscribe("sess_1", platform="test")
+    assert request.options == ("Allow", "Deny")
 
 
 @pytest.mark.asyncio
-async def test_permission_request_choice():
+async def test_permission_request_choice(subscriber, bridge):
     """Test AskUserQuestion creates a choice ApprovalRequest."""
-    subscriber, bridge, store = _make_subscriber()
-
     subscriber.subscribe("sess_1", "test")
     queue = subscriber._queues["sess_1"]
 
@@ -387,116 +327,23 @@ async def test_permission_request_choice():
             },
         }
     )
-    await asyncio.sleep(0.05)
+    await _drain(queue)
 
-    assert len(bridge.approvals) == 1
-    session_id, request = bridge.approvals[0]
+    assert len(bridge.events["approval"]) == 1
+    session_id, request = bridge.events["approval"][0]
     assert session_id == "sess_1"
     assert request.kind == "choice"
     assert request.title == "Select env"
-    assert request.options == ["staging", "production"]
+    assert request.options == ("staging", "production")
     assert "staging" in request.description
     assert "production" in request.description
 
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_session_state_running():
-    """Test RUNNING state triggers on_typing."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
-
-    queue.put_nowait({"type": "session_state", "data": {"state": "RUNNING"}})
-    await asyncio.sleep(0.05)
-
-    assert "sess_1" in bridge.typing_started
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_session_state_awaiting_input():
-    """Test AWAITING_INPUT state triggers on_typing_stopped."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
-
-    queue.put_nowait({"type": "session_state", "data": {"state": "AWAITING_INPUT"}})
-    await asyncio.sleep(0.05)
-
-    assert "sess_1" in bridge.typing_stopped
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_session_state_error():
-    """Test ERROR state triggers typing_stopped and status_change."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
-
-    queue.put_nowait({"type": "session_state", "data": {"state": "ERROR"}})
-    await asyncio.sleep(0.05)
-
-    assert "sess_1" in bridge.typing_stopped
-    assert any(s == "error" for _, s, _ in bridge.statuses)
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_error_event():
-    """Test error event triggers on_status_change with message."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
-
-    queue.put_nowait({"type": "error", "data": {"message": "Connection lost"}})
-    await asyncio.sleep(0.05)
-
-    assert len(bridge.statuses) == 1
-    assert bridge.statuses[0][0] == "sess_1"
-    assert bridge.statuses[0][1] == "error"
-    assert bridge.statuses[0][2] == {"message": "Connection lost"}
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
-
-@pytest.mark.asyncio
-async def test_history_events_skipped():
-    """Test events with is_history=True are skipped."""
-    subscriber, bridge, store = _make_subscriber()
-
-    subscriber.subscribe("sess_1", "test")
-    queue = subscriber._queues["sess_1"]
-
-    queue.put_nowait(
-        {
-            "type": "output",
-            "data": {"text": "Old message", "final": True, "is_history": True},
-        }
-    )
-    queue.put_nowait({"type": "output", "data": {"text": "New message", "final": True}})
-    await asyncio.sleep(0.05)
-
-    assert len(bridge.outputs) == 1
-    assert bridge.outputs[0] == ("sess_1", "New message")
-
-    await subscriber.unsubscribe("sess_1", platform="test")
-
 
 @pytest.mark.asyncio
 async def test_bridge_error_doesnt_crash_consumer():
     """Test that an error in bridge handling doesn't crash the consumer."""
 
-    class ExplodingBridge(FakeBridge):
+    class ExplodingBridge(RecordingBridge):
         async def on_output(self, session_id, text, metadata=None):
             raise RuntimeError("Boom!")
 
@@ -510,13 +357,26 @@ async def test_bridge_error_doesnt_crash_consumer():
     queue = subscriber._queues["sess_1"]
 
     # This should not crash the consumer
-    queue.put_nowait({"type": "output", "data": {"text": "Boom!", "final": True}})
-    await asyncio.sleep(0.05)
+    queue.put_nowait(_output("Boom!", final=True))
+    await _drain(queue)
 
     # Consumer should still be alive and processing
-    queue.put_nowait({"type": "session_state", "data": {"state": "AWAITING_INPUT"}})
-    await asyncio.sleep(0.05)
+    queue.put_nowait(_AWAITING_INPUT)
+    await _drain(queue)
 
-    assert "sess_1" in bridge.typing_stopped
+    assert "sess_1" in bridge.events["typing_stopped"]
 
     await subscriber.unsubscribe("sess_1", platform="test")
+
+
+@pytest.mark.asyncio
+async def test_burst_routed_in_order(subscriber, bridge):
+    """Test events queued back to back are routed in the order they were queued."""
+    subscriber.subscribe("sess_1", "test")
+    queue = subscriber._queues["sess_1"]
+
+    for i in range(5):
+        queue.put_nowait(_output(f"msg {i}", final=True))
+    await _drain(queue)
+
+    assert [text for _, text, _ in bridge.events["output"]] == [f"msg {i}" for i in range(5)]
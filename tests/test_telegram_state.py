@@ -1,16 +1,23 @@
 """Tests for Telegram StateManager."""
 
 import json
+import os
 
 import pytest
 
 from agent_tether.telegram.state import StateManager
 
 
+@pytest.fixture(scope="module")
+def state_dir(tmp_path_factory):
+    """One temporary directory shared by every test in this module."""
+    return tmp_path_factory.mktemp("telegram_state")
+
+
 @pytest.fixture
-def state_path(tmp_path):
-    """Return a temporary state file path."""
-    return str(tmp_path / "telegram_state.json")
+def state_path(state_dir, request):
+    """Return a state file path unique to the current test."""
+    return str(state_dir / f"{request.node.name}.json")
 
 
 def test_set_and_get_topic(state_path):
@@ -99,9 +106,10 @@ def test_multiple_sessions(state_path):
     """Test managing multiple sessions."""
     sm = StateManager(state_path)
 
-    sm.set_topic_for_session("sess_1", 100, "Session 1")
-    sm.set_topic_for_session("sess_2", 200, "Session 2")
-    sm.set_topic_for_session("sess_3", 300, "Session 3")
+    with sm.batch():
+        sm.set_topic_for_session("sess_1", 100, "Session 1")
+        sm.set_topic_for_session("sess_2", 200, "Session 2")
+        sm.set_topic_for_session("sess_3", 300, "Session 3")
 
     assert sm.get_topic_for_session("sess_1") == 100
     assert sm.get_topic_for_session("sess_2") == 200
@@ -114,6 +122,24 @@ def test_multiple_sessions(state_path):
     assert sm.get_topic_for_session("sess_3") == 300
 
 
+def test_batch_defers_save_until_exit(state_path):
+    """Test changes inside batch() are written once, when the batch exits."""
+    sm = StateManager(state_path)
+
+    with sm.batch():
+        sm.set_topic_for_session("sess_1", 100, "Session 1")
+        with sm.batch():
+            sm.set_topic_for_session("sess_2", 200, "Session 2")
+        assert not os.path.exists(state_path)
+        sm.remove_session("sess_1")
+        assert not os.path.exists(state_path)
+
+    sm2 = StateManager(state_path)
+    sm2.load()
+    assert sm2.get_topic_for_session("sess_1") is None
+    assert sm2.get_topic_for_session("sess_2") == 200
+
+
 def test_overwrite_session_topic(state_path):
     """Test overwriting a session's topic mapping."""
     sm = StateManager(state_path)
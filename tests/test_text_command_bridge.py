@@ -1,13 +1,16 @@
 """Tests for TextCommandBridge shared logic."""
 
+import dataclasses
 import json
+import shutil
 from pathlib import Path
-from unittest.mock import AsyncMock
 
 import pytest
 
 from agent_tether.base import ApprovalRequest, BridgeCallbacks, BridgeConfig
 from agent_tether.text_command_bridge import TextCommandBridge
+from agent_tether.thread_state import load_mapping, save_mapping
+from tests.helpers import async_return
 
 
 class FakeTextBridge(TextCommandBridge):
@@ -33,39 +36,93 @@ class FakeTextBridge(TextCommandBridge):
         return {"thread_id": f"thread_{session_id}"}
 
 
+@pytest.fixture
+def bridge(tmp_path):
+    """A FakeTextBridge with no persisted thread names and default callbacks."""
+    return FakeTextBridge(tmp_path)
+
+
+def _unexpected_callback(name):
+    async def _fail(*args, **kwargs):
+        raise AssertionError(f"unexpected BridgeCallbacks.{name} call")
+
+    return _fail
+
+
+# Required BridgeCallbacks fields, resolved once rather than per test.
+_REQUIRED_CALLBACKS = tuple(
+    f.name for f in dataclasses.fields(BridgeCallbacks) if f.default is dataclasses.MISSING
+)
+
+
+@pytest.fixture
+def callbacks():
+    """BridgeCallbacks whose every callback fails the test if called.
+
+    Tests replace the callbacks they exercise.
+    """
+    return BridgeCallbacks(**{name: _unexpected_callback(name) for name in _REQUIRED_CALLBACKS})
+
+
+@pytest.fixture(scope="session")
+def persisted_state_template(tmp_path_factory):
+    """A state directory whose threads.json already reserves "MyProject".
+
+    Built once per session; tests copy it into their own ``tmp_path``.
+    """
+    template = tmp_path_factory.mktemp("text_bridge_template")
+    save_mapping(path=template / "threads.json", mapping={"old_sess": "MyProject"})
+    return template
+
+
 # ========== Thread naming ==========
 
 
-def test_pick_unique_thread_name_first(tmp_path):
+def test_pick_unique_thread_name_first(bridge):
     """Test first name is returned as-is."""
-    bridge = FakeTextBridge(tmp_path)
     assert bridge._pick_unique_thread_name("MyProject") == "MyProject"
 
 
-def test_pick_unique_thread_name_dedup(tmp_path):
+def test_pick_unique_thread_name_dedup(bridge):
     """Test duplicate names get a suffix."""
-    bridge = FakeTextBridge(tmp_path)
     bridge._used_thread_names.add("MyProject")
     assert bridge._pick_unique_thread_name("MyProject") == "MyProject 2"
 
 
-def test_pick_unique_thread_name_multiple_dupes(tmp_path):
+def test_pick_unique_thread_name_multiple_dupes(bridge):
     """Test multiple duplicates get incrementing suffixes."""
-    bridge = FakeTextBridge(tmp_path)
     bridge._used_thread_names.update({"MyProject", "MyProject 2", "MyProject 3"})
     assert bridge._pick_unique_thread_name("MyProject") == "MyProject 4"
 
 
-def test_make_external_thread_name(tmp_path):
-    """Test thread name is derived from directory."""
+def test_pick_unique_thread_name_reuses_released_suffix(bridge):
+    """Test a released suffix is picked again rather than a higher one."""
+    for i, name in enumerate(["MyProject", "MyProject 2", "MyProject 3"]):
+        bridge._reserve_thread_name(f"sess_{i}", name)
+    assert bridge._pick_unique_thread_name("MyProject") == "MyProject 4"
+
+    bridge._release_thread_name("sess_1")
+
+    assert bridge._pick_unique_thread_name("MyProject") == "MyProject 2"
+
+
+def test_pick_unique_thread_name_respects_persisted_names(persisted_state_template, tmp_path):
+    """Test names loaded from an existing threads.json count as used."""
+    shutil.copytree(persisted_state_template, tmp_path, dirs_exist_ok=True)
     bridge = FakeTextBridge(tmp_path)
+
+    assert bridge._thread_names == {"old_sess": "MyProject"}
+    assert bridge._pick_unique_thread_name("MyProject") == "MyProject 2"
+
+
+def test_make_external_thread_name(bridge):
+    """Test thread name is derived from directory."""
     name = bridge._make_external_thread_name(directory="/home/user/my-repo", session_id="s1")
     assert name == "My-repo"
 
 
-def test_make_external_thread_name_with_runner_type(tmp_path):
+def test_make_external_thread_name_with_runner_type(bridge):
     """Test thread name includes runner label when runner_type is given."""
-    bridge = FakeTextBridge(tmp_path)
     name = bridge._make_external_thread_name(
         directory="/home/user/my-repo",
         session_id="s1",
@@ -74,9 +131,8 @@ def test_make_external_thread_name_with_runner_type(tmp_path):
     assert name == "Pi / My-repo"
 
 
-def test_make_external_thread_name_with_claude_runner(tmp_path):
+def test_make_external_thread_name_with_claude_runner(bridge):
     """Test Claude runner types all map to 'Claude' label."""
-    bridge = FakeTextBridge(tmp_path)
     name = bridge._make_external_thread_name(
         directory="/home/user/project",
         session_id="s1",
@@ -85,9 +141,8 @@ def test_make_external_thread_name_with_claude_runner(tmp_path):
     assert name == "Claude / Project"
 
 
-def test_make_external_thread_name_unknown_runner(tmp_path):
+def test_make_external_thread_name_unknown_runner(bridge):
     """Test unknown runner_type falls back to directory-only name."""
-    bridge = FakeTextBridge(tmp_path)
     name = bridge._make_external_thread_name(
         directory="/home/user/my-repo",
         session_id="s1",
@@ -96,17 +151,15 @@ def test_make_external_thread_name_unknown_runner(tmp_path):
     assert name == "My-repo"
 
 
-def test_make_external_thread_name_dedup(tmp_path):
+def test_make_external_thread_name_dedup(bridge):
     """Test duplicate directory names get suffixed."""
-    bridge = FakeTextBridge(tmp_path)
     bridge._used_thread_names.add("My-repo")
     name = bridge._make_external_thread_name(directory="/home/user/my-repo", session_id="s1")
     assert name == "My-repo 2"
 
 
-def test_make_external_thread_name_dedup_with_runner(tmp_path):
+def test_make_external_thread_name_dedup_with_runner(bridge):
     """Test dedup works with runner prefix too."""
-    bridge = FakeTextBridge(tmp_path)
     bridge._used_thread_names.add("Pi / My-repo")
     name = bridge._make_external_thread_name(
         directory="/home/user/my-repo",
@@ -119,9 +172,8 @@ def test_make_external_thread_name_dedup_with_runner(tmp_path):
 # ========== Thread name persistence ==========
 
 
-def test_reserve_and_release_thread_name(tmp_path):
+def test_reserve_and_release_thread_name(bridge, tmp_path):
     """Test reserving and releasing thread names persists to disk."""
-    bridge = FakeTextBridge(tmp_path)
     bridge._reserve_thread_name("sess_1", "MyProject")
 
     assert "MyProject" in bridge._used_thread_names
@@ -133,10 +185,33 @@ def test_reserve_and_release_thread_name(tmp_path):
     assert "sess_1" not in bridge._thread_names
 
 
+def test_reserve_same_name_skips_save(bridge, tmp_path):
+    """Test re-reserving a session's current name does not rewrite the file."""
+    path = tmp_path / "threads.json"
+    bridge._reserve_thread_name("sess_1", "MyProject")
+    path.unlink()
+
+    bridge._reserve_thread_name("sess_1", "MyProject")
+
+    assert not path.exists()
+
+
+def test_batch_thread_mutations_saves_once_on_exit(bridge, tmp_path):
+    """Test thread name changes inside a batch are written when it exits."""
+    path = tmp_path / "threads.json"
+
+    with bridge.batch_thread_mutations():
+        bridge._reserve_thread_name("sess_1", "One")
+        bridge._reserve_thread_name("sess_2", "Two")
+        bridge._release_thread_name("sess_1")
+        assert not path.exists()
+
+    assert load_mapping(path=path) == {"sess_2": "Two"}
+
+
 @pytest.mark.asyncio
-async def test_on_session_removed_releases_name(tmp_path):
+async def test_on_session_removed_releases_name(bridge):
     """Test on_session_removed cleans up thread names."""
-    bridge = FakeTextBridge(tmp_path)
     bridge._reserve_thread_name("sess_1", "MyProject")
     bridge.set_allow_all("sess_1")
 
@@ -149,21 +224,34 @@ async def test_on_session_removed_releases_name(tmp_path):
 # ========== _parse_list_args ==========
 
 
-def test_parse_list_args_empty(tmp_path):
+def test_parse_list_args_empty(bridge):
     """Test empty args returns page 1, no query."""
-    bridge = FakeTextBridge(tmp_path)
     assert bridge._parse_list_args("") == (1, None)
 
 
-def test_parse_list_args_page_number(tmp_path):
+def test_parse_list_args_page_number(bridge):
     """Test numeric arg is parsed as page number."""
-    bridge = FakeTextBridge(tmp_path)
     assert bridge._parse_list_args("3") == (3, None)
 
 
-def test_parse_list_args_search_query(tmp_path):
+def test_parse_list_args_whitespace_only(bridge):
+    """Test whitespace-only args behave like empty args."""
+    assert bridge._parse_list_args("   ") == (1, None)
+
+
+def test_parse_list_args_page_keeps_previous_query(bridge):
+    """Test a page number keeps the current search query and ignores trailing words."""
+    bridge._external_query = "my-repo"
+    assert bridge._parse_list_args("2 other") == (2, "my-repo")
+
+
+def test_parse_list_args_number_prefixed_query(bridge):
+    """Test a token that merely starts with digits is a search query."""
+    assert bridge._parse_list_args("2fa-service") == (1, "2fa-service")
+
+
+def test_parse_list_args_search_query(bridge):
     """Test non-numeric arg is parsed as search query."""
-    bridge = FakeTextBridge(tmp_path)
     assert bridge._parse_list_args("my-repo") == (1, "my-repo")
 
 
@@ -171,35 +259,30 @@ def test_parse_list_args_search_query(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_parse_new_args_no_context_no_args(tmp_path):
+async def test_parse_new_args_no_context_no_args(bridge):
     """Test no args and no base session raises ValueError."""
-    bridge = FakeTextBridge(tmp_path)
     with pytest.raises(ValueError, match="Usage"):
         await bridge._parse_new_args("", base_session_id=None)
 
 
 @pytest.mark.asyncio
-async def test_parse_new_args_unknown_agent(tmp_path):
+async def test_parse_new_args_unknown_agent(bridge):
     """Test unknown agent name raises ValueError."""
-    bridge = FakeTextBridge(tmp_path)
     with pytest.raises(ValueError, match="Unknown agent"):
         await bridge._parse_new_args("badagent /tmp", base_session_id=None)
 
 
 @pytest.mark.asyncio
-async def test_parse_new_args_agent_without_dir(tmp_path):
+async def test_parse_new_args_agent_without_dir(bridge):
     """Test agent name without directory (outside session) raises ValueError."""
-    bridge = FakeTextBridge(tmp_path)
     with pytest.raises(ValueError, match="Usage"):
         await bridge._parse_new_args("claude", base_session_id=None)
 
 
 @pytest.mark.asyncio
-async def test_parse_new_args_directory_only(tmp_path):
+async def test_parse_new_args_directory_only(callbacks, tmp_path):
     """Test bare directory resolves correctly."""
-    check_dir = AsyncMock(return_value={"exists": True, "path": "/tmp"})
-    callbacks = AsyncMock(spec=BridgeCallbacks)
-    callbacks.check_directory = check_dir
+    callbacks.check_directory = async_return({"exists": True, "path": "/tmp"})
 
     bridge = FakeTextBridge(tmp_path, callbacks=callbacks)
     adapter, directory = await bridge._parse_new_args("/tmp", base_session_id=None)
@@ -212,11 +295,9 @@ async def test_parse_new_args_directory_only(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_handle_approval_text_response_allow(tmp_path):
+async def test_handle_approval_text_response_allow(callbacks, tmp_path):
     """Test approval allow response."""
-    respond = AsyncMock(return_value=True)
-    callbacks = AsyncMock(spec=BridgeCallbacks)
-    callbacks.respond_to_permission = respond
+    callbacks.respond_to_permission = async_return(True)
 
     bridge = FakeTextBridge(tmp_path, callbacks=callbacks)
     request = ApprovalRequest(request_id="req_1", title="Bash", description="ls", options=[])
@@ -230,11 +311,9 @@ async def test_handle_approval_text_response_allow(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_handle_approval_text_response_deny_with_reason(tmp_path):
+async def test_handle_approval_text_response_deny_with_reason(callbacks, tmp_path):
     """Test approval deny with reason."""
-    respond = AsyncMock(return_value=True)
-    callbacks = AsyncMock(spec=BridgeCallbacks)
-    callbacks.respond_to_permission = respond
+    callbacks.respond_to_permission = async_return(True)
 
     bridge = FakeTextBridge(tmp_path, callbacks=callbacks)
     request = ApprovalRequest(request_id="req_1", title="Bash", description="rm -rf", options=[])
@@ -248,11 +327,9 @@ async def test_handle_approval_text_response_deny_with_reason(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_handle_approval_text_response_allow_all_timer(tmp_path):
+async def test_handle_approval_text_response_allow_all_timer(callbacks, tmp_path):
     """Test approval with allow-all timer sets the timer."""
-    respond = AsyncMock(return_value=True)
-    callbacks = AsyncMock(spec=BridgeCallbacks)
-    callbacks.respond_to_permission = respond
+    callbacks.respond_to_permission = async_return(True)
 
     bridge = FakeTextBridge(tmp_path, callbacks=callbacks)
     request = ApprovalRequest(request_id="req_1", title="Bash", description="ls", options=[])
@@ -269,11 +346,9 @@ async def test_handle_approval_text_response_allow_all_timer(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_format_external_replay_no_messages(tmp_path):
+async def test_format_external_replay_no_messages(callbacks, tmp_path):
     """Test replay returns None when there are no messages."""
-    get_history = AsyncMock(return_value={"messages": []})
-    callbacks = AsyncMock(spec=BridgeCallbacks)
-    callbacks.get_external_history = get_history
+    callbacks.get_external_history = async_return({"messages": []})
 
     bridge = FakeTextBridge(tmp_path, callbacks=callbacks)
     result = await bridge._format_external_replay("ext_1", "claude")
@@ -281,18 +356,16 @@ async def test_format_external_replay_no_messages(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_format_external_replay_with_messages(tmp_path):
+async def test_format_external_replay_with_messages(callbacks, tmp_path):
     """Test replay formats messages correctly."""
-    get_history = AsyncMock(
-        return_value={
+    callbacks.get_external_history = async_return(
+        {
             "messages": [
                 {"role": "user", "content": "fix the bug"},
                 {"role": "assistant", "content": "I'll look at it."},
             ]
         }
     )
-    callbacks = AsyncMock(spec=BridgeCallbacks)
-    callbacks.get_external_history = get_history
 
     bridge = FakeTextBridge(tmp_path, callbacks=callbacks)
     result = await bridge._format_external_replay("ext_1", "claude")
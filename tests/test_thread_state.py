@@ -1,6 +1,7 @@
 """Tests for thread_state load/save."""
 
 import json
+import stat
 
 import pytest
 
@@ -18,6 +19,17 @@ def test_save_and_load(tmp_path):
     assert loaded == mapping
 
 
+def test_save_keeps_file_mode(tmp_path):
+    """Test saving over an existing file keeps its permissions."""
+    path = tmp_path / "threads.json"
+    path.write_text("{}")
+    path.chmod(0o644)
+
+    save_mapping(path=path, mapping={"sess_1": "Thread 1"})
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
 def test_load_missing_file(tmp_path):
     """Test loading from missing file returns empty dict."""
     path = tmp_path / "nonexistent.json"